@@ -4,5 +4,12 @@ from orekit.pyhelpers import setup_orekit_curdir
 DEFAULT_DATA_PATH = "./data/orekit-data.zip"
 
 def initialize(data_path=DEFAULT_DATA_PATH):
+    init_vm()
+    load_data(data_path)
+
+def init_vm():
     orekit.initVM()
+
+def load_data(data_path=DEFAULT_DATA_PATH):
+    # Accepts either the orekit-data.zip archive or a pre-extracted directory, which avoids crawling the zip on start
     setup_orekit_curdir(data_path)
\ No newline at end of file
@@ -0,0 +1,51 @@
+import json
+from typing import Dict, List, Optional
+
+Results = Dict[str, Dict[str, float]]
+
+
+class BenchmarkBaseline:
+    DEFAULT_TOLERANCE = 0.15
+    LOWER_IS_BETTER_SUFFIX = "_time"
+    HIGHER_IS_BETTER_SUFFIX = "_per_second"
+
+    def __init__(self, results: Results, environment: Optional[Dict[str, str]] = None) -> None:
+        self.results: Results = results
+        self.environment: Dict[str, str] = environment or {}
+
+    @classmethod
+    def load(cls, path: str) -> "BenchmarkBaseline":
+        with open(path) as baseline_file:
+            content = json.load(baseline_file)
+        return cls(content["results"], content.get("environment"))
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as baseline_file:
+            json.dump({"environment": self.environment, "results": self.results}, baseline_file, indent=4,
+                      sort_keys=True)
+
+    def compare(self, results: Results, tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, object]]:
+        regressions = []
+        for benchmark, metrics in sorted(results.items()):
+            reference_metrics = self.results.get(benchmark, {})
+            for metric, value in sorted(metrics.items()):
+                reference = reference_metrics.get(metric)
+                if reference is None or reference <= 0.:
+                    continue
+                change = (value - reference) / reference
+                if self.is_regression(metric, change, tolerance):
+                    regressions.append({"benchmark": benchmark, "metric": metric, "baseline": reference,
+                                        "current": value, "change": change})
+        return regressions
+
+    def is_regression(self, metric: str, change: float, tolerance: float) -> bool:
+        if metric.endswith(self.LOWER_IS_BETTER_SUFFIX):
+            return change > tolerance
+        if metric.endswith(self.HIGHER_IS_BETTER_SUFFIX):
+            return change < -tolerance
+        return False
+
+    def environment_differences(self, environment: Dict[str, str]) -> Dict[str, tuple]:
+        return {key: (self.environment.get(key), environment.get(key))
+                for key in sorted(set(self.environment) | set(environment))
+                if self.environment.get(key) != environment.get(key)}
@@ -0,0 +1,169 @@
+import itertools
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import orekit
+from org.orekit.bodies import CelestialBodyFactory
+from org.orekit.orbits import PositionAngleType
+from org.orekit.time import AbsoluteDate, TimeScalesFactory
+
+from data import OrekitInitializer
+from src.benchmark.StepCounterHandler import StepCounterHandler
+from src.orbits import OrbitUtils
+from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory
+from src.propagation.ColumnarEphemeris import ephemeris_dtype
+from src.propagation.PropagationPostProcessing import PropagationPostProcessing
+from src.propagation.PropagatorFactory import PropagatorFactory
+
+STARTUP_SCRIPT = """
+import json
+import time
+start = time.perf_counter()
+from data import OrekitInitializer
+imported = time.perf_counter()
+OrekitInitializer.init_vm()
+initialized = time.perf_counter()
+OrekitInitializer.load_data({data_path!r})
+from org.orekit.time import TimeScalesFactory
+TimeScalesFactory.getUTC()
+loaded = time.perf_counter()
+print(json.dumps({{"import_time": imported - start, "jvm_init_time": initialized - imported,
+                  "data_loading_time": loaded - initialized, "startup_time": loaded - start}}))
+"""
+
+
+class PropagationBenchmark:
+    GROUPS = ("startup", "propagation", "step_handler", "post_processing")
+    DEFAULT_REPEAT = 3
+    SEMI_MAJOR_AXIS = 6787.4 * 1000
+    ECCENTRICITY = 0.7292925
+    FORCE_MODEL_CASES = tuple(itertools.product((False, True), repeat=3))
+    GEOPOTENTIAL_SIZES = ((10, 10), (20, 20))
+    HANDLER_STEPS = (600., 60., 10.)
+    POST_PROCESSING_SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+
+    def __init__(self, repeat: int = DEFAULT_REPEAT, duration: Optional[float] = None,
+                 data_path: str = OrekitInitializer.DEFAULT_DATA_PATH) -> None:
+        moon = CelestialBodyFactory.getMoon()
+        self.repeat: int = repeat
+        self.data_path: str = data_path
+        self.start: AbsoluteDate = AbsoluteDate(2025, 1, 23, 0, 0, 0.0, TimeScalesFactory.getUTC())
+        self.duration: float = duration or float(OrbitUtils.keplerian_period_equation(moon.getGM(),
+                                                                                       self.SEMI_MAJOR_AXIS))
+        self.end: AbsoluteDate = self.start.shiftedBy(self.duration)
+        self.initial_orbit = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(),
+                                                   moon.getGM()).create_keplerian_orbit(
+            self.start, self.SEMI_MAJOR_AXIS, self.ECCENTRICITY, np.pi / 2, 0., 0., 0.)
+
+    def run(self, groups: Iterable[str] = GROUPS) -> Dict[str, Dict[str, float]]:
+        results = {}
+        for group in groups:
+            results.update(getattr(self, "run_" + group)())
+        return results
+
+    def run_startup(self) -> Dict[str, Dict[str, float]]:
+        # The JVM can only be started once per process, so every measurement runs in a fresh interpreter
+        samples = [self.measure_startup() for _ in range(self.repeat)]
+        return {"startup": {metric: min(sample[metric] for sample in samples) for metric in samples[0]}}
+
+    def run_propagation(self) -> Dict[str, Dict[str, float]]:
+        cases = [flags + (PropagatorFactory.DEFAULT_GEOPOTENTIAL_DEGREE, PropagatorFactory.DEFAULT_GEOPOTENTIAL_ORDER)
+                 for flags in self.FORCE_MODEL_CASES]
+        cases += [(True, False, False, degree, order) for degree, order in self.GEOPOTENTIAL_SIZES]
+        return {self.propagation_name(*case): self.measure_propagation(*case) for case in cases}
+
+    def run_step_handler(self) -> Dict[str, Dict[str, float]]:
+        return {"step_handler_{:g}s".format(step): self.measure_step_handler(step) for step in self.HANDLER_STEPS}
+
+    def run_post_processing(self) -> Dict[str, Dict[str, float]]:
+        return {"post_processing_{}".format(size): self.measure_post_processing(size)
+                for size in self.POST_PROCESSING_SIZES}
+
+    def best_time(self, function: Callable[[], object]) -> float:
+        function()
+        durations = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            function()
+            durations.append(time.perf_counter() - start)
+        return min(durations)
+
+    def propagation_name(self, is_geopotential_added: bool, is_earth_added: bool, is_sun_added: bool,
+                         degree: int, order: int) -> str:
+        parts = ["geopotential_{}x{}".format(degree, order)] if is_geopotential_added else []
+        parts += ["earth"] if is_earth_added else []
+        parts += ["sun"] if is_sun_added else []
+        return "propagation_" + "_".join(parts or ["central_body"])
+
+    def propagate(self, propagator_factory: PropagatorFactory, configure: Callable[[object], object] = None):
+        propagator = propagator_factory.acquire_propagator(self.initial_orbit)
+        try:
+            result = configure and configure(propagator)
+            propagator.propagate(self.start, self.end)
+        finally:
+            propagator_factory.release_propagator(propagator)
+        return result
+
+    def measure_propagation(self, is_geopotential_added: bool, is_earth_added: bool, is_sun_added: bool,
+                            degree: int, order: int) -> Dict[str, float]:
+        propagator_factory = PropagatorFactory(is_geopotential_added, is_earth_added, is_sun_added, degree, order)
+        wall_time = self.best_time(lambda: self.propagate(propagator_factory))
+        step_counter = self.propagate(propagator_factory, self.add_step_counter)
+        return {"steps": step_counter.step_number, "wall_time": wall_time,
+                "steps_per_second": step_counter.step_number / wall_time}
+
+    def add_step_counter(self, propagator) -> StepCounterHandler:
+        step_counter = StepCounterHandler()
+        propagator.getMultiplexer().add(step_counter)
+        return step_counter
+
+    def measure_step_handler(self, step: float) -> Dict[str, float]:
+        propagator_factory = PropagatorFactory(False, False, False)
+        reference_time = self.best_time(lambda: self.propagate(propagator_factory))
+        wall_time = self.best_time(lambda: self.propagate(
+            propagator_factory,
+            lambda propagator: propagator_factory.add_fixed_step_handler(propagator, self.start, step=step)))
+        callbacks = int(self.duration / step) + 1
+        return {"callbacks": callbacks, "wall_time": wall_time,
+                "callback_time": max(wall_time - reference_time, 0.) / callbacks}
+
+    def measure_post_processing(self, size: int) -> Dict[str, float]:
+        ephemeris_primary, ephemeris_secondary = self.synthetic_ephemerides(size)
+        post_processor = PropagationPostProcessing(self.start)
+
+        def post_process():
+            post_processor.check_time_steps(ephemeris_primary, ephemeris_secondary)
+            post_processor.compute_relative_motion(ephemeris_primary, ephemeris_secondary)
+
+        wall_time = self.best_time(post_process)
+        return {"states": size, "wall_time": wall_time, "states_per_second": size / wall_time}
+
+    def synthetic_ephemerides(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        mean_motion = 2. * np.pi / self.duration
+        ephemerides = []
+        for phase in (0., 1e-3):
+            ephemeris = np.empty(size, dtype=ephemeris_dtype())
+            ephemeris["t"] = np.linspace(0., self.duration, size)
+            angle = mean_motion * ephemeris["t"] + phase
+            speed = mean_motion * self.SEMI_MAJOR_AXIS
+            ephemeris["x"], ephemeris["y"], ephemeris["z"] = (self.SEMI_MAJOR_AXIS * np.cos(angle),
+                                                              self.SEMI_MAJOR_AXIS * np.sin(angle), 0.)
+            ephemeris["vx"], ephemeris["vy"], ephemeris["vz"] = -speed * np.sin(angle), speed * np.cos(angle), 0.
+            ephemerides.append(ephemeris)
+        return ephemerides[0], ephemerides[1]
+
+    def measure_startup(self) -> Dict[str, float]:
+        completed = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT.format(data_path=self.data_path)],
+                                   capture_output=True, text=True, check=True)
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def environment(self) -> Dict[str, str]:
+        return {"python": platform.python_version(), "platform": platform.platform(),
+                "processor": platform.processor() or platform.machine(), "numpy": np.__version__,
+                "orekit": getattr(orekit, "VERSION", "unknown"), "repeat": str(self.repeat),
+                "duration": repr(self.duration)}
@@ -0,0 +1,18 @@
+from org.orekit.propagation import SpacecraftState
+from org.orekit.propagation.sampling import OrekitStepInterpolator, PythonOrekitStepHandler
+from org.orekit.time import AbsoluteDate
+
+
+class StepCounterHandler(PythonOrekitStepHandler):
+    def __init__(self):
+        super(StepCounterHandler, self).__init__()
+        self.step_number: int = 0
+
+    def init(self, initial_state: SpacecraftState, t: AbsoluteDate):
+        self.step_number = 0
+
+    def handleStep(self, interpolator: OrekitStepInterpolator):
+        self.step_number += 1
+
+    def finish(self, final_state: SpacecraftState):
+        pass
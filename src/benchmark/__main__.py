@@ -0,0 +1,57 @@
+import argparse
+import sys
+from typing import List, Optional
+
+from data import OrekitInitializer
+from src.benchmark.BenchmarkBaseline import BenchmarkBaseline
+from src.benchmark.PropagationBenchmark import PropagationBenchmark
+
+
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Lunar orbit separation performance benchmarks")
+    parser.add_argument("--data-path", default=OrekitInitializer.DEFAULT_DATA_PATH,
+                        help="orekit-data.zip archive or pre-extracted Orekit data directory")
+    parser.add_argument("--groups", nargs="+", choices=PropagationBenchmark.GROUPS,
+                        default=list(PropagationBenchmark.GROUPS), help="benchmark groups to run")
+    parser.add_argument("--repeat", type=int, default=PropagationBenchmark.DEFAULT_REPEAT,
+                        help="timed repetitions per benchmark, the best one is kept")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the results as a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON file to compare the results against")
+    parser.add_argument("--tolerance", type=float, default=BenchmarkBaseline.DEFAULT_TOLERANCE,
+                        help="relative slowdown above which a metric is flagged as a regression")
+    return parser.parse_args(arguments)
+
+
+def print_results(results) -> None:
+    for benchmark, metrics in sorted(results.items()):
+        print(benchmark)
+        for metric, value in sorted(metrics.items()):
+            print("\t - {:<20} {:14.6g}".format(metric, value))
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    arguments = parse_arguments(arguments)
+    OrekitInitializer.initialize(arguments.data_path)
+    benchmark = PropagationBenchmark(arguments.repeat, data_path=arguments.data_path)
+    current = BenchmarkBaseline(benchmark.run(arguments.groups), benchmark.environment())
+    print_results(current.results)
+
+    if arguments.save_baseline:
+        current.save(arguments.save_baseline)
+        print("\nBaseline written to", arguments.save_baseline)
+    if not arguments.compare:
+        return 0
+
+    baseline = BenchmarkBaseline.load(arguments.compare)
+    for key, (reference, value) in baseline.environment_differences(current.environment).items():
+        print("Warning: {} differs from the baseline: {} vs {}".format(key, reference, value))
+    regressions = baseline.compare(current.results, arguments.tolerance)
+    for regression in regressions:
+        print("REGRESSION {benchmark}.{metric}: {baseline:.6g} -> {current:.6g} ({change:+.1%})".format(**regression))
+    print("\n{} regression(s) above {:.0%} against {}".format(len(regressions), arguments.tolerance,
+                                                            arguments.compare))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class CampaignResult:
+    METRICS_DTYPE = np.dtype([("run_id", np.int64),
+                              ("final_separation", np.float64),
+                              ("minimum_separation_after_threshold", np.float64),
+                              ("time_to_threshold", np.float64)])
+    PERCENTILES = (5., 50., 95.)
+
+    def __init__(self, metrics: Optional[np.ndarray] = None) -> None:
+        self._chunks: List[np.ndarray] = [] if metrics is None else [metrics]
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self._chunks)
+
+    @property
+    def metrics(self) -> np.ndarray:
+        if len(self._chunks) != 1:
+            merged = np.concatenate(self._chunks) if self._chunks else np.empty(0, dtype=self.METRICS_DTYPE)
+            self._chunks = [merged]
+        return self._chunks[0]
+
+    def add(self, metrics: np.ndarray) -> None:
+        self._chunks.append(metrics)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        metrics = np.sort(self.metrics, order="run_id")
+        summary = {}
+        for name in self.METRICS_DTYPE.names[1:]:
+            values = metrics[name]
+            finite_values = values[np.isfinite(values)]
+            statistics = {"count": int(finite_values.size)}
+            if finite_values.size:
+                statistics.update(mean=float(finite_values.mean()), std=float(finite_values.std()),
+                                  min=float(finite_values.min()), max=float(finite_values.max()))
+                statistics.update({"p{:g}".format(percentile): float(value) for percentile, value in
+                                   zip(self.PERCENTILES, np.percentile(finite_values, self.PERCENTILES))})
+            summary[name] = statistics
+        return summary
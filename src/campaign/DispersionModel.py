@@ -0,0 +1,50 @@
+from typing import Optional
+
+import numpy as np
+
+
+class DispersionModel:
+    SAMPLE_DTYPE = np.dtype([("run_id", np.int64),
+                             ("delta_v", np.float64),
+                             ("in_plane_pointing", np.float64),
+                             ("out_of_plane_pointing", np.float64),
+                             ("burn_epoch_offset", np.float64),
+                             ("semi_major_axis_offset", np.float64),
+                             ("eccentricity_offset", np.float64),
+                             ("inclination_offset", np.float64),
+                             ("true_anomaly_offset", np.float64)])
+
+    def __init__(self, nominal_delta_v: float, delta_v_relative_sigma: float = 0., pointing_sigma: float = 0.,
+                 burn_epoch_sigma: float = 0., semi_major_axis_sigma: float = 0., eccentricity_sigma: float = 0.,
+                 inclination_sigma: float = 0., true_anomaly_sigma: float = 0.) -> None:
+        self.nominal_delta_v: float = nominal_delta_v
+        self.delta_v_relative_sigma: float = delta_v_relative_sigma
+        self.pointing_sigma: float = pointing_sigma
+        self.burn_epoch_sigma: float = burn_epoch_sigma
+        self.semi_major_axis_sigma: float = semi_major_axis_sigma
+        self.eccentricity_sigma: float = eccentricity_sigma
+        self.inclination_sigma: float = inclination_sigma
+        self.true_anomaly_sigma: float = true_anomaly_sigma
+
+    def sample(self, run_number: int, seed: Optional[int] = None) -> np.ndarray:
+        generator = np.random.default_rng(seed)
+        samples = np.empty(run_number, dtype=self.SAMPLE_DTYPE)
+        samples["run_id"] = np.arange(run_number)
+        samples["delta_v"] = self.nominal_delta_v * (1. + self.delta_v_relative_sigma *
+                                                     generator.standard_normal(run_number))
+        samples["in_plane_pointing"] = self.pointing_sigma * generator.standard_normal(run_number)
+        samples["out_of_plane_pointing"] = self.pointing_sigma * generator.standard_normal(run_number)
+        samples["burn_epoch_offset"] = self.burn_epoch_sigma * generator.standard_normal(run_number)
+        samples["semi_major_axis_offset"] = self.semi_major_axis_sigma * generator.standard_normal(run_number)
+        samples["eccentricity_offset"] = self.eccentricity_sigma * generator.standard_normal(run_number)
+        samples["inclination_offset"] = self.inclination_sigma * generator.standard_normal(run_number)
+        samples["true_anomaly_offset"] = self.true_anomaly_sigma * generator.standard_normal(run_number)
+        return samples
+
+    @staticmethod
+    def delta_v_tnw(samples: np.ndarray) -> np.ndarray:
+        cos_out_of_plane = np.cos(samples["out_of_plane_pointing"])
+        return samples["delta_v"][:, np.newaxis] * np.stack(
+            (cos_out_of_plane * np.cos(samples["in_plane_pointing"]),
+             cos_out_of_plane * np.sin(samples["in_plane_pointing"]),
+             np.sin(samples["out_of_plane_pointing"])), axis=-1)
@@ -0,0 +1,95 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, Tuple
+
+import numpy as np
+
+from data import OrekitInitializer
+from src.campaign.CampaignResult import CampaignResult
+from src.campaign.DispersionModel import DispersionModel
+from src.campaign.SeparationRunner import SeparationRunner
+from src.campaign.SeparationScenario import SeparationScenario
+
+_worker_runner = None
+
+
+def _initialize_worker(data_path: str, scenario: SeparationScenario) -> None:
+    global _worker_runner
+    OrekitInitializer.initialize(data_path)
+    _worker_runner = SeparationRunner(scenario)
+
+
+def _run_chunk(samples: np.ndarray) -> np.ndarray:
+    return _worker_runner.run_all(samples)
+
+
+class MonteCarloCampaign:
+    DEFAULT_CHUNK_SIZE = 8
+    DEFAULT_CHECKPOINT_INTERVAL = 10
+
+    def __init__(self, scenario: SeparationScenario, dispersion_model: DispersionModel, run_number: int,
+                 seed: Optional[int] = None, worker_number: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, checkpoint_path: Optional[str] = None,
+                 checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+                 data_path: str = OrekitInitializer.DEFAULT_DATA_PATH) -> None:
+        self.scenario: SeparationScenario = scenario
+        self.dispersion_model: DispersionModel = dispersion_model
+        self.run_number: int = run_number
+        self.seed: Optional[int] = seed
+        self.worker_number: int = worker_number or os.cpu_count() or 1
+        self.chunk_size: int = chunk_size
+        self.checkpoint_path: Optional[str] = checkpoint_path
+        self.checkpoint_interval: int = checkpoint_interval
+        self.data_path: str = data_path
+
+    def run(self) -> CampaignResult:
+        # A resumed campaign reuses the checkpointed samples so that an unseeded campaign is not mixed with a new draw
+        checkpoint = self.load_checkpoint()
+        samples, metrics = checkpoint if checkpoint is not None else (
+            self.dispersion_model.sample(self.run_number, self.seed), None)
+        self.scenario.check_burn_epochs(samples)
+        result = CampaignResult(metrics)
+        pending_samples = samples[~np.isin(samples["run_id"], result.metrics["run_id"])]
+        chunks = [pending_samples[index:index + self.chunk_size]
+                  for index in range(0, len(pending_samples), self.chunk_size)]
+        if not chunks:
+            return result
+
+        # The JVM cannot survive a fork, so each worker is spawned and initializes its own Orekit context once
+        with ProcessPoolExecutor(max_workers=self.worker_number, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_initialize_worker,
+                                 initargs=(self.data_path, self.scenario)) as executor:
+            futures = [executor.submit(_run_chunk, chunk) for chunk in chunks]
+            for completed_number, future in enumerate(as_completed(futures), 1):
+                result.add(future.result())
+                if completed_number % self.checkpoint_interval == 0:
+                    self.save_checkpoint(result, samples)
+
+        self.save_checkpoint(result, samples)
+        return result
+
+    def configuration(self) -> str:
+        return json.dumps({"run_number": self.run_number, "seed": self.seed,
+                           "dispersion_model": vars(self.dispersion_model), "scenario": vars(self.scenario)},
+                          sort_keys=True)
+
+    def load_checkpoint(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return None
+        with np.load(self.checkpoint_path) as checkpoint:
+            configuration = str(checkpoint["configuration"]) if "configuration" in checkpoint.files else None
+            if configuration != self.configuration():
+                raise ValueError("Checkpoint {} was written by a different campaign configuration.".format(
+                    self.checkpoint_path))
+            return checkpoint["samples"], checkpoint["metrics"]
+
+    def save_checkpoint(self, result: CampaignResult, samples: np.ndarray) -> None:
+        if self.checkpoint_path is None:
+            return
+        temporary_path = self.checkpoint_path + ".tmp"
+        with open(temporary_path, "wb") as checkpoint_file:
+            np.savez(checkpoint_file, configuration=np.array(self.configuration()), samples=samples,
+                     metrics=result.metrics)
+        os.replace(temporary_path, self.checkpoint_path)
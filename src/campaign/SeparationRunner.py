@@ -0,0 +1,67 @@
+import numpy as np
+from org.hipparchus.geometry.euclidean.threed import Vector3D
+from org.orekit.bodies import CelestialBodyFactory
+from org.orekit.orbits import PositionAngleType
+from org.orekit.time import AbsoluteDate, TimeScalesFactory
+
+from src.campaign.CampaignResult import CampaignResult
+from src.campaign.DispersionModel import DispersionModel
+from src.campaign.SeparationScenario import SeparationScenario
+from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory
+from src.propagation import EphemerisAnalysis
+from src.propagation.PropagatorFactory import PropagatorFactory
+
+
+class SeparationRunner:
+
+    def __init__(self, scenario: SeparationScenario) -> None:
+        moon = CelestialBodyFactory.getMoon()
+        self.scenario: SeparationScenario = scenario
+        self.burn_epoch: AbsoluteDate = AbsoluteDate(scenario.burn_epoch, TimeScalesFactory.getUTC())
+        self.orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(),
+                                                   moon.getGM())
+        self.propagator_factory = PropagatorFactory(scenario.is_geopotential_added, scenario.is_earth_added,
+                                                    scenario.is_sun_added)
+
+    def run_all(self, samples: np.ndarray) -> np.ndarray:
+        metrics = np.empty(len(samples), dtype=CampaignResult.METRICS_DTYPE)
+        for index, (sample, delta_v_tnw) in enumerate(zip(samples, DispersionModel.delta_v_tnw(samples))):
+            metrics[index] = self.run(sample, delta_v_tnw)
+        return metrics
+
+    def run(self, sample: np.void, delta_v_tnw: np.ndarray) -> tuple:
+        scenario = self.scenario
+        burn_orbit = self.orbit_factory.create_keplerian_orbit(
+            self.burn_epoch, scenario.semi_major_axis + float(sample["semi_major_axis_offset"]),
+            scenario.eccentricity + float(sample["eccentricity_offset"]),
+            scenario.inclination + float(sample["inclination_offset"]), scenario.argument_of_periapsis,
+            scenario.raan, scenario.true_anomaly + float(sample["true_anomaly_offset"]))
+        initial_orbit = burn_orbit.shiftedBy(-scenario.burn_margin)
+        start = initial_orbit.getDate()
+        end = self.burn_epoch.shiftedBy(scenario.duration)
+
+        scenario.check_burn_epochs(sample[np.newaxis])
+        burn_epoch_offset = float(sample["burn_epoch_offset"])
+
+        primary_propagator = self.propagator_factory.acquire_propagator(initial_orbit)
+        try:
+            secondary_propagator = self.propagator_factory.acquire_propagator(initial_orbit)
+            try:
+                self.propagator_factory.add_impulse_maneuver(
+                    secondary_propagator, self.burn_epoch.shiftedBy(burn_epoch_offset),
+                    Vector3D(*map(float, delta_v_tnw)), scenario.isp)
+                primary_ephemeris, secondary_ephemeris = self.propagator_factory.propagate_in_parallel(
+                    [primary_propagator, secondary_propagator], start, end, scenario.handler_step)
+            finally:
+                self.propagator_factory.release_propagator(secondary_propagator)
+        finally:
+            self.propagator_factory.release_propagator(primary_propagator)
+
+        separation = EphemerisAnalysis.relative_distance(primary_ephemeris, secondary_ephemeris)
+        time_since_burn = primary_ephemeris["t"] - (scenario.burn_margin + burn_epoch_offset)
+        after_burn = time_since_burn >= 0.
+        time_to_threshold = EphemerisAnalysis.first_crossing_time(time_since_burn[after_burn], separation[after_burn],
+                                                                  scenario.separation_threshold)
+        after_threshold = time_since_burn >= time_to_threshold
+        minimum_separation = separation[after_threshold].min() if after_threshold.any() else np.nan
+        return int(sample["run_id"]), separation[-1], minimum_separation, time_to_threshold
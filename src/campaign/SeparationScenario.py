@@ -0,0 +1,33 @@
+import numpy as np
+
+
+class SeparationScenario:
+    DEFAULT_BURN_MARGIN = 600.
+    DEFAULT_SEPARATION_THRESHOLD = 10000.
+
+    def __init__(self, burn_epoch: str, semi_major_axis: float, eccentricity: float, inclination: float,
+                 argument_of_periapsis: float, raan: float, true_anomaly: float, duration: float,
+                 is_geopotential_added: bool = True, is_earth_added: bool = True, is_sun_added: bool = True,
+                 handler_step: float = 60., separation_threshold: float = DEFAULT_SEPARATION_THRESHOLD,
+                 burn_margin: float = DEFAULT_BURN_MARGIN, isp: float = 240.) -> None:
+        self.burn_epoch: str = burn_epoch
+        self.semi_major_axis: float = semi_major_axis
+        self.eccentricity: float = eccentricity
+        self.inclination: float = inclination
+        self.argument_of_periapsis: float = argument_of_periapsis
+        self.raan: float = raan
+        self.true_anomaly: float = true_anomaly
+        self.duration: float = duration
+        self.is_geopotential_added: bool = is_geopotential_added
+        self.is_earth_added: bool = is_earth_added
+        self.is_sun_added: bool = is_sun_added
+        self.handler_step: float = handler_step
+        self.separation_threshold: float = separation_threshold
+        self.burn_margin: float = burn_margin
+        self.isp: float = isp
+
+    def check_burn_epochs(self, samples: np.ndarray) -> None:
+        early_burns = samples["run_id"][samples["burn_epoch_offset"] < -self.burn_margin]
+        if early_burns.size:
+            raise ValueError("Runs {} burn before the propagation start, increase the scenario burn margin of {} s."
+                             .format(early_burns.tolist(), self.burn_margin))
@@ -1,9 +1,21 @@
+import time
+
+_START_TIME = time.perf_counter()
+
+import argparse
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
 import numpy as np
 import orekit
 
 from data import OrekitInitializer
 from src.orbits import OrbitUtils
 from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory
+from src.propagation.EphemerisCache import EphemerisCache
+from src.propagation.PropagationInstrumentation import PropagationInstrumentation
 from src.propagation.PropagationPostProcessing import PropagationPostProcessing
 from src.propagation.PropagatorFactory import PropagatorFactory
 
@@ -12,132 +24,241 @@ from org.orekit.orbits import PositionAngleType
 from org.orekit.time import TimeScalesFactory, AbsoluteDate
 from org.orekit.utils import Constants
 
-print("Main script starting\n")
-
-# Orekit is an open-source astrodynamics toolbox offering several useful classes and methods which can be used here
-# Originally in Java, the Python wrapper used here needs to initialize an Orekit context
-print("Initializing Orekit context...\n")
-OrekitInitializer.initialize()
-
-# Celestial bodies physical characteristics and ephemeris are taken from publicized international standards such as JPL and IAU
-moon = CelestialBodyFactory.getMoon()
-mu_moon = moon.getGM()
-
-# The initial orbit here is an elliptical orbit of 100 x 10 000 km.
-# Let's assume at first that the initial state is at periapsis with true anomaly = 0deg
-initial_epoch = AbsoluteDate(2025, 1, 23, 0, 0, 0.0, TimeScalesFactory.getUTC())  # Start simulation on my birthday
-rp = 100 * 1000 + Constants.MOON_EQUATORIAL_RADIUS
-ra = 10000 * 1000 + Constants.MOON_EQUATORIAL_RADIUS
-semi_major_axis = (rp + ra) / 2.
-eccentricity = (ra - rp) / (ra + rp)
-inclination = float(np.deg2rad(90.)) # Let's assume a polar orbit which has the advantage of covering all latitudes and have well-defined nodes
-argument_of_periapsis = float(np.deg2rad(0.))
-raan = float(np.deg2rad(0.))
-true_anomaly = float(np.deg2rad(0.))
-
-print("Initial orbit parameters are:")
-print("\t - Initial epoch = ", initial_epoch)
-print("\t - Semi major axis (km) = ", semi_major_axis/1000)
-print("\t - Eccentricity = ", eccentricity)
-print("\t - Inclination (deg) = ", np.rad2deg(inclination))
-print("\t - Argument of Periapsis (deg) = ", np.rad2deg(argument_of_periapsis))
-print("\t - Right Ascension of Ascending Node (deg) = ", np.rad2deg(raan))
-print("\t - True Anomaly (deg) = ", np.rad2deg(true_anomaly))
-
-lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), mu_moon)
-
-initial_orbit_primary = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, semi_major_axis, eccentricity,
-                                                                   inclination,
-                                                                   argument_of_periapsis, raan, true_anomaly)
-
-# Compute the Keplerian period
-keplerian_period = OrbitUtils.keplerian_period_equation(mu_moon, semi_major_axis)
-print("\nInitial keplerian period is: ", keplerian_period, " s")
-
-# Compute initial orbit speed at periapsis since this is where the maximum orbital velocity is reached
-velocity_at_periapsis = initial_orbit_primary.getPVCoordinates().getVelocity().getNorm()
-print("\nInitial orbit velocity at periapsis = ", velocity_at_periapsis, " m/s")
-print("Initial orbit velocity at apoapsis = ", OrbitUtils.live_forces_equation(mu_moon, ra, semi_major_axis), " m/s")
-
-# First assuming linear behaviour around periapsis, create initial guess of period difference needed to achieve 10km separation in relative distance at periapsis.
-
-# The hypothesis here is that a phasing difference in revolution period will be used to create an in-plane separation
-# Since a phasing difference is efficiently achieved by a tangential deltaV, as opposed to a normal to the plane or radial separation,
-# this will be the preferred method here to achieve the required separation of 10km.
-
-# Note that this is very dependent on the actual separation need. For anti-collision purposes, it might be worth investigating a radial separation instead
-period_difference = 10000 / velocity_at_periapsis
-target_keplerian_period = keplerian_period + period_difference
-target_semi_major_axis = float(np.cbrt(mu_moon * np.square(target_keplerian_period / (2 * np.pi))))
-print("\nTarget semi-major axis = ", target_semi_major_axis/1000, " km")
-
-# Using the live forces equation to compute deltaV needed at periapsis to achieve this semi major axis
-target_delta_V_at_periapsis = (OrbitUtils.live_forces_equation(mu_moon, rp, target_semi_major_axis) -
-                               OrbitUtils.live_forces_equation(mu_moon, rp, semi_major_axis))
-print("Target deltaV at periapsis = ", target_delta_V_at_periapsis, " m/s")
-
-# Compare with performing the same maneuver at apoapsis. The target period difference would of course be greater at apogee since orbital speed is at its minimum.
-# So the required deltaV would also be greater. Here the interesting metric is the required deltaV to perform the same change in semi-major axis as the periapsis case.
-target_delta_V_at_apoapsis = (OrbitUtils.live_forces_equation(mu_moon, ra, target_semi_major_axis) -
-                              OrbitUtils.live_forces_equation(mu_moon, ra, semi_major_axis))
-print("Target deltaV at apoapsis = ", target_delta_V_at_apoapsis, " m/s")
-
-# So to achieve the same change in semi-major axis, which wouldn't even be enough to create the required phase difference,
-# a deltaV performed at apoapsis would be less efficient
-
-# The above problem assumes that the deltaV is instantaneous. However, propulsion systems do not have infinite thrust.
-# In order to check if the gravity losses should be considered for a spread-out burn, the burn duration/orbital period is studied.
-
-# Physical characteristics now have to be detailed a bit more. Let's assume the maneuvering spacecraft looks like Hakuto-R lander from Mission 1.
-# Total mass is from Nasa website. Isp and thrust are typical values for attitude thrusters chemical propulsion system as I don't have detailed specs.
-burn_duration = OrbitUtils.rocket_equation_duration_from_delta_v(1000, 240, 20, target_delta_V_at_periapsis)
-print("\nBurn duration = ", burn_duration, " s")
-print("Burn duration represents  ", burn_duration/keplerian_period*100, " % of total revolution period")
-# Since the burn duration is very small, let's assume impulsive maneuver to simplify the problem.
-
-# The initial orbit of the secondary takes this into account by assuming instantaneous change in semi-major axis at initial epoch
-# Eccentricity would also vary, but it is assumed fixed since the point of interest is the periapsis of both objects
-initial_orbit_secondary = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, target_semi_major_axis,
-                                                                     eccentricity,inclination,
-                                                                     argument_of_periapsis, raan, true_anomaly)
-
-# So to reach the same target semi-major axis, a deltaV performed at periapsis is more efficient.
-# Given our assumption of period difference, we can check that the relative distance between the two satellites is
-# more than 10km after one revolution by actually performing a numerical propagation of the two objects states
-
-# About propagation: since the notion of separation makes more sense from an osculating orbit point of view,
-# a numerical propagation will be used to compare the relative distances between the primary and secondary object.
-
-# However, since we are only interested in a single revolution, the force model can be simplified to only take into
-# account the major orbital perturbations around the Moon and not the second-order ones
-# (such as the SRP where we would need to define an object surface and radiation coefficient)
-print("\nPropagating primary and secondary spacecrafts...\n")
-
-add_geopotential = True  # Only 3/3 should cover the majority of geopotential accelerations
-add_earth_third_body = True
-add_sun_third_body = True
-end_epoch = initial_epoch.shiftedBy(float(keplerian_period))
-
-# Note that this is where using an open-source well known library such as Orekit comes in handy.
-# There is no need to re-code a heavy-duty propagation, just to set it up with the required parameters.
-propagator_factory = PropagatorFactory(add_geopotential, add_earth_third_body, add_sun_third_body)
-
-primary_propagator = propagator_factory.create_propagator(initial_orbit_primary)
-primary_handler = propagator_factory.add_fixed_step_handler(primary_propagator)
-primary_propagator.propagate(initial_epoch, end_epoch)
-
-secondary_propagator = propagator_factory.create_propagator(initial_orbit_secondary)
-secondary_handler = propagator_factory.add_fixed_step_handler(secondary_propagator)
-secondary_propagator.propagate(initial_epoch, end_epoch)
-
-print("Propagation duration = ", end_epoch.durationFrom(initial_epoch), " s")
-
-# Once propagation is done for both objects, this is where the outputs can be created.
-# Here there are only a couple of plots generated but a lot more metrics could be observed from the states ephemeris
-print("Post-processing...")
-post_processor = PropagationPostProcessing(initial_epoch)
-post_processor.post_process(primary_handler.states, secondary_handler.states)
-
-# Achieved relative distance after one revolution is indeed 10 km!
-
-print("\nAll done!\n")
+RESULTS_FILE_NAME = "results.json"
+EPHEMERIDES_FILE_NAME = "ephemerides.npz"
+INSTRUMENTATION_FILE_NAME = "instrumentation.json"
+TRACE_FILE_NAME = "trace.json"
+
+
+class PhaseTimer:
+
+    def __init__(self) -> None:
+        self.durations: Dict[str, float] = {"imports": time.perf_counter() - _START_TIME}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.) + time.perf_counter() - start
+
+    def report(self) -> None:
+        print("Timing breakdown:")
+        for name, duration in self.durations.items():
+            print("\t - {:<16} {:10.3f} s".format(name, duration))
+        print("\t - {:<16} {:10.3f} s".format("total", time.perf_counter() - _START_TIME))
+
+
+def parse_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Lunar orbit separation study")
+    parser.add_argument("--data-path", default=OrekitInitializer.DEFAULT_DATA_PATH,
+                        help="orekit-data.zip archive or pre-extracted Orekit data directory")
+    parser.add_argument("--headless", action="store_true",
+                        help="write results to the output directory instead of displaying plots")
+    parser.add_argument("--output-dir", default="output", help="output directory used in headless mode")
+    parser.add_argument("--png", action="store_true", help="also save the plots as PNG files in headless mode")
+    parser.add_argument("--instrument", action="store_true",
+                        help="collect integrator, force model and callback metrics and write them with a Chrome trace "
+                             "to the output directory")
+    parser.add_argument("--cache-dir", help="directory where ephemerides are cached so that a repeated run is loaded "
+                                            "from disk instead of propagated again")
+    return parser.parse_args(arguments)
+
+
+def design_separation() -> Dict[str, object]:
+    # Celestial bodies physical characteristics and ephemeris are taken from publicized international standards such as JPL and IAU
+    moon = CelestialBodyFactory.getMoon()
+    mu_moon = moon.getGM()
+
+    # The initial orbit here is an elliptical orbit of 100 x 10 000 km.
+    # Let's assume at first that the initial state is at periapsis with true anomaly = 0deg
+    initial_epoch = AbsoluteDate(2025, 1, 23, 0, 0, 0.0, TimeScalesFactory.getUTC())  # Start simulation on my birthday
+    rp = 100 * 1000 + Constants.MOON_EQUATORIAL_RADIUS
+    ra = 10000 * 1000 + Constants.MOON_EQUATORIAL_RADIUS
+    semi_major_axis = (rp + ra) / 2.
+    eccentricity = (ra - rp) / (ra + rp)
+    inclination = float(np.deg2rad(90.)) # Let's assume a polar orbit which has the advantage of covering all latitudes and have well-defined nodes
+    argument_of_periapsis = float(np.deg2rad(0.))
+    raan = float(np.deg2rad(0.))
+    true_anomaly = float(np.deg2rad(0.))
+
+    print("Initial orbit parameters are:")
+    print("\t - Initial epoch = ", initial_epoch)
+    print("\t - Semi major axis (km) = ", semi_major_axis/1000)
+    print("\t - Eccentricity = ", eccentricity)
+    print("\t - Inclination (deg) = ", np.rad2deg(inclination))
+    print("\t - Argument of Periapsis (deg) = ", np.rad2deg(argument_of_periapsis))
+    print("\t - Right Ascension of Ascending Node (deg) = ", np.rad2deg(raan))
+    print("\t - True Anomaly (deg) = ", np.rad2deg(true_anomaly))
+
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), mu_moon)
+
+    initial_orbit_primary = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, semi_major_axis, eccentricity,
+                                                                       inclination,
+                                                                       argument_of_periapsis, raan, true_anomaly)
+
+    # Compute the Keplerian period
+    keplerian_period = OrbitUtils.keplerian_period_equation(mu_moon, semi_major_axis)
+    print("\nInitial keplerian period is: ", keplerian_period, " s")
+
+    # Compute initial orbit speed at periapsis since this is where the maximum orbital velocity is reached
+    velocity_at_periapsis = initial_orbit_primary.getPVCoordinates().getVelocity().getNorm()
+    print("\nInitial orbit velocity at periapsis = ", velocity_at_periapsis, " m/s")
+    print("Initial orbit velocity at apoapsis = ", OrbitUtils.live_forces_equation(mu_moon, ra, semi_major_axis), " m/s")
+
+    # First assuming linear behaviour around periapsis, create initial guess of period difference needed to achieve 10km separation in relative distance at periapsis.
+
+    # The hypothesis here is that a phasing difference in revolution period will be used to create an in-plane separation
+    # Since a phasing difference is efficiently achieved by a tangential deltaV, as opposed to a normal to the plane or radial separation,
+    # this will be the preferred method here to achieve the required separation of 10km.
+
+    # Note that this is very dependent on the actual separation need. For anti-collision purposes, it might be worth investigating a radial separation instead
+    period_difference = 10000 / velocity_at_periapsis
+    target_keplerian_period = keplerian_period + period_difference
+    target_semi_major_axis = float(OrbitUtils.semi_major_axis_from_period(mu_moon, target_keplerian_period))
+    print("\nTarget semi-major axis = ", target_semi_major_axis/1000, " km")
+
+    # Using the live forces equation to compute deltaV needed at periapsis to achieve this semi major axis
+    target_delta_V_at_periapsis = (OrbitUtils.live_forces_equation(mu_moon, rp, target_semi_major_axis) -
+                                   OrbitUtils.live_forces_equation(mu_moon, rp, semi_major_axis))
+    print("Target deltaV at periapsis = ", target_delta_V_at_periapsis, " m/s")
+
+    # Compare with performing the same maneuver at apoapsis. The target period difference would of course be greater at apogee since orbital speed is at its minimum.
+    # So the required deltaV would also be greater. Here the interesting metric is the required deltaV to perform the same change in semi-major axis as the periapsis case.
+    target_delta_V_at_apoapsis = (OrbitUtils.live_forces_equation(mu_moon, ra, target_semi_major_axis) -
+                                  OrbitUtils.live_forces_equation(mu_moon, ra, semi_major_axis))
+    print("Target deltaV at apoapsis = ", target_delta_V_at_apoapsis, " m/s")
+
+    # So to achieve the same change in semi-major axis, which wouldn't even be enough to create the required phase difference,
+    # a deltaV performed at apoapsis would be less efficient
+
+    # The above problem assumes that the deltaV is instantaneous. However, propulsion systems do not have infinite thrust.
+    # In order to check if the gravity losses should be considered for a spread-out burn, the burn duration/orbital period is studied.
+
+    # Physical characteristics now have to be detailed a bit more. Let's assume the maneuvering spacecraft looks like Hakuto-R lander from Mission 1.
+    # Total mass is from Nasa website. Isp and thrust are typical values for attitude thrusters chemical propulsion system as I don't have detailed specs.
+    burn_duration = OrbitUtils.rocket_equation_duration_from_delta_v(1000, 240, 20, target_delta_V_at_periapsis)
+    print("\nBurn duration = ", burn_duration, " s")
+    print("Burn duration represents  ", burn_duration/keplerian_period*100, " % of total revolution period")
+    # Since the burn duration is very small, let's assume impulsive maneuver to simplify the problem.
+
+    # The initial orbit of the secondary takes this into account by assuming instantaneous change in semi-major axis at initial epoch
+    # Eccentricity would also vary, but it is assumed fixed since the point of interest is the periapsis of both objects
+    initial_orbit_secondary = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, target_semi_major_axis,
+                                                                         eccentricity,inclination,
+                                                                         argument_of_periapsis, raan, true_anomaly)
+
+    return {"initial_epoch": initial_epoch,
+            "keplerian_period": float(keplerian_period),
+            "initial_orbit_primary": initial_orbit_primary,
+            "initial_orbit_secondary": initial_orbit_secondary,
+            "summary": {"semi_major_axis": semi_major_axis,
+                        "eccentricity": eccentricity,
+                        "keplerian_period": float(keplerian_period),
+                        "velocity_at_periapsis": velocity_at_periapsis,
+                        "target_semi_major_axis": target_semi_major_axis,
+                        "target_delta_v_at_periapsis": float(target_delta_V_at_periapsis),
+                        "target_delta_v_at_apoapsis": float(target_delta_V_at_apoapsis),
+                        "burn_duration": float(burn_duration)}}
+
+
+def propagate_separation(design: Dict[str, object], instrumentation: Optional[PropagationInstrumentation] = None,
+                         cache: Optional[EphemerisCache] = None):
+    # So to reach the same target semi-major axis, a deltaV performed at periapsis is more efficient.
+    # Given our assumption of period difference, we can check that the relative distance between the two satellites is
+    # more than 10km after one revolution by actually performing a numerical propagation of the two objects states
+
+    # About propagation: since the notion of separation makes more sense from an osculating orbit point of view,
+    # a numerical propagation will be used to compare the relative distances between the primary and secondary object.
+
+    # However, since we are only interested in a single revolution, the force model can be simplified to only take into
+    # account the major orbital perturbations around the Moon and not the second-order ones
+    # (such as the SRP where we would need to define an object surface and radiation coefficient)
+    print("\nPropagating primary and secondary spacecrafts...\n")
+
+    add_geopotential = True  # Only 3/3 should cover the majority of geopotential accelerations
+    add_earth_third_body = True
+    add_sun_third_body = True
+    initial_epoch = design["initial_epoch"]
+    end_epoch = initial_epoch.shiftedBy(design["keplerian_period"])
+
+    # Note that this is where using an open-source well known library such as Orekit comes in handy.
+    # There is no need to re-code a heavy-duty propagation, just to set it up with the required parameters.
+    propagator_factory = PropagatorFactory(add_geopotential, add_earth_third_body, add_sun_third_body,
+                                           instrumentation=instrumentation)
+
+    # Both spacecrafts are propagated together on the same step grid so that their ephemerides are aligned by construction
+    initial_orbits = [design["initial_orbit_primary"], design["initial_orbit_secondary"]]
+    if cache is None:
+        primary_ephemeris, secondary_ephemeris = propagator_factory.propagate_formation(initial_orbits, initial_epoch,
+                                                                                        end_epoch)
+    else:
+        primary_ephemeris, secondary_ephemeris = cache.propagate_formation(propagator_factory, initial_orbits,
+                                                                           initial_epoch, end_epoch)
+
+    print("Propagation duration = ", end_epoch.durationFrom(initial_epoch), " s")
+    return primary_ephemeris, secondary_ephemeris
+
+
+def write_results(output_directory: str, design: Dict[str, object], primary_ephemeris: np.ndarray,
+                  secondary_ephemeris: np.ndarray, relative_motion: np.ndarray, timer: PhaseTimer) -> None:
+    np.savez(os.path.join(output_directory, EPHEMERIDES_FILE_NAME), primary=primary_ephemeris,
+             secondary=secondary_ephemeris, relative_motion=relative_motion)
+    results = dict(design["summary"], initial_epoch=str(design["initial_epoch"]),
+                   final_relative_distance=float(relative_motion["distance"][-1]), timings=timer.durations)
+    with open(os.path.join(output_directory, RESULTS_FILE_NAME), "w") as results_file:
+        json.dump(results, results_file, indent=4)
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    arguments = parse_arguments(arguments)
+    timer = PhaseTimer()
+    print("Main script starting\n")
+
+    # Orekit is an open-source astrodynamics toolbox offering several useful classes and methods which can be used here
+    # Originally in Java, the Python wrapper used here needs to initialize an Orekit context
+    print("Initializing Orekit context...\n")
+    with timer.phase("jvm_init"):
+        OrekitInitializer.init_vm()
+    with timer.phase("data_loading"):
+        OrekitInitializer.load_data(arguments.data_path)
+
+    with timer.phase("design"):
+        design = design_separation()
+
+    instrumentation = PropagationInstrumentation() if arguments.instrument else None
+    cache = EphemerisCache(arguments.cache_dir, data_path=arguments.data_path) if arguments.cache_dir else None
+    with timer.phase("propagation"):
+        primary_ephemeris, secondary_ephemeris = propagate_separation(design, instrumentation, cache)
+
+    # Once propagation is done for both objects, this is where the outputs can be created.
+    # Here there are only a couple of plots generated but a lot more metrics could be observed from the states ephemeris
+    print("Post-processing...")
+    post_processor = PropagationPostProcessing(design["initial_epoch"])
+    with timer.phase("post_processing"):
+        output_directory = arguments.output_dir if arguments.headless else None
+        if arguments.headless:
+            os.makedirs(output_directory, exist_ok=True)
+            if arguments.png:
+                import matplotlib
+                matplotlib.use("Agg")
+        relative_motion = post_processor.post_process(primary_ephemeris, secondary_ephemeris,
+                                                      output_directory=output_directory,
+                                                      is_plotted=not arguments.headless or arguments.png)
+
+    if arguments.headless:
+        write_results(output_directory, design, primary_ephemeris, secondary_ephemeris, relative_motion, timer)
+    if instrumentation is not None:
+        os.makedirs(arguments.output_dir, exist_ok=True)
+        instrumentation.save_report(os.path.join(arguments.output_dir, INSTRUMENTATION_FILE_NAME))
+        instrumentation.save_trace(os.path.join(arguments.output_dir, TRACE_FILE_NAME))
+
+    # Achieved relative distance after one revolution is indeed 10 km!
+
+    print("\nAll done!\n")
+    timer.report()
+
+
+if __name__ == "__main__":
+    main()
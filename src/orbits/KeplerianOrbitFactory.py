@@ -1,7 +1,10 @@
 import orekit
+import numpy as np
+from org.hipparchus.geometry.euclidean.threed import Vector3D
 from org.orekit.frames import Frame
-from org.orekit.orbits import KeplerianOrbit, PositionAngleType
+from org.orekit.orbits import KeplerianOrbit, Orbit, PositionAngleType
 from org.orekit.time import AbsoluteDate
+from org.orekit.utils import PVCoordinates
 
 
 class KeplerianOrbitFactory:
@@ -14,4 +17,18 @@ class KeplerianOrbitFactory:
     def create_keplerian_orbit(self, epoch: AbsoluteDate, semi_major_axis: float, eccentricity: float,
                                inclination: float, argument_of_periapsis: float, raan: float, true_anomaly: float):
         return KeplerianOrbit(semi_major_axis, eccentricity, inclination, argument_of_periapsis, raan, true_anomaly,
-                              self.anomaly_type, self.frame, epoch, self.central_body_mu)
\ No newline at end of file
+                              self.anomaly_type, self.frame, epoch, self.central_body_mu)
+
+    def create_maneuvered_orbit(self, orbit: Orbit, delta_v_tnw: np.ndarray):
+        pv = orbit.getPVCoordinates(self.frame)
+        tnw = tnw_frame(np.array(pv.getPosition().toArray()), np.array(pv.getVelocity().toArray()))
+        delta_v = tnw.T @ np.asarray(delta_v_tnw, dtype=float)
+        maneuvered_pv = PVCoordinates(pv.getPosition(), pv.getVelocity().add(Vector3D(*map(float, delta_v))))
+        return KeplerianOrbit(maneuvered_pv, self.frame, orbit.getDate(), self.central_body_mu)
+
+
+def tnw_frame(position: np.ndarray, velocity: np.ndarray) -> np.ndarray:
+    tangential = np.asarray(velocity) / np.linalg.norm(velocity)
+    momentum = np.cross(position, velocity)
+    cross_track = momentum / np.linalg.norm(momentum)
+    return np.stack((tangential, np.cross(cross_track, tangential), cross_track))
@@ -1,15 +1,25 @@
 import orekit
 import numpy as np
+from numpy.typing import ArrayLike
 from org.orekit.utils import Constants
 
 
-def live_forces_equation(mu: float, radius: float, semi_major_axis: float):
+def live_forces_equation(mu: float, radius: ArrayLike, semi_major_axis: ArrayLike):
+    radius, semi_major_axis = np.asarray(radius, dtype=float), np.asarray(semi_major_axis, dtype=float)
     return np.sqrt(mu* (2/radius - 1/semi_major_axis))
 
-def keplerian_period_equation(mu: float, semi_major_axis: float):
-    return 2 * np.pi * np.sqrt(np.power(semi_major_axis,3)/mu)
+def keplerian_period_equation(mu: float, semi_major_axis: ArrayLike):
+    return 2 * np.pi * np.sqrt(np.power(np.asarray(semi_major_axis, dtype=float),3)/mu)
 
-def rocket_equation_duration_from_delta_v(initial_mass: float, isp: float, thrust:float, delta_v:float):
+def semi_major_axis_from_period(mu: float, keplerian_period: ArrayLike):
+    return np.cbrt(mu * np.square(np.asarray(keplerian_period, dtype=float) / (2 * np.pi)))
+
+def orbit_radius_equation(semi_major_axis: ArrayLike, eccentricity: ArrayLike, true_anomaly: ArrayLike):
+    eccentricity = np.asarray(eccentricity, dtype=float)
+    return semi_major_axis * (1 - np.square(eccentricity)) / (1 + eccentricity * np.cos(true_anomaly))
+
+def rocket_equation_duration_from_delta_v(initial_mass: ArrayLike, isp: ArrayLike, thrust: ArrayLike,
+                                          delta_v: ArrayLike):
     moon_standard_acceleration = Constants.JPL_SSD_MOON_GM / Constants.MOON_EQUATORIAL_RADIUS**2
-    exhaust_velocity = moon_standard_acceleration * isp
-    return initial_mass*exhaust_velocity/thrust*(1-np.exp(-delta_v/exhaust_velocity))
\ No newline at end of file
+    exhaust_velocity = moon_standard_acceleration * np.asarray(isp, dtype=float)
+    return initial_mass*exhaust_velocity/thrust*(1-np.exp(-np.asarray(delta_v, dtype=float)/exhaust_velocity))
@@ -0,0 +1,63 @@
+from typing import Dict
+
+import numpy as np
+from numpy.typing import ArrayLike
+from org.orekit.utils import Constants
+
+from src.orbits import OrbitUtils
+
+
+class TradeStudyResult:
+
+    def __init__(self, axes: Dict[str, np.ndarray], target_semi_major_axis: np.ndarray, delta_v: np.ndarray,
+                 burn_duration: np.ndarray, keplerian_period: np.ndarray) -> None:
+        self.axes: Dict[str, np.ndarray] = axes
+        self.target_semi_major_axis: np.ndarray = target_semi_major_axis
+        self.delta_v: np.ndarray = delta_v
+        self.burn_duration: np.ndarray = burn_duration
+        self.burn_period_ratio: np.ndarray = burn_duration / keplerian_period
+
+    @property
+    def shape(self):
+        return tuple(len(axis) for axis in self.axes.values())
+
+    def design_point(self, flat_index: int) -> Dict[str, float]:
+        index = np.unravel_index(flat_index, self.shape)
+        return {name: float(axis[axis_index]) for (name, axis), axis_index in zip(self.axes.items(), index)}
+
+
+class SeparationTradeStudy:
+    AXES = ("periapsis_altitude", "apoapsis_altitude", "separation", "burn_true_anomaly", "initial_mass", "isp",
+            "thrust")
+
+    def __init__(self, mu: float = Constants.JPL_SSD_MOON_GM,
+                 body_radius: float = Constants.MOON_EQUATORIAL_RADIUS) -> None:
+        self.mu: float = mu
+        self.body_radius: float = body_radius
+
+    def evaluate(self, periapsis_altitude: ArrayLike, apoapsis_altitude: ArrayLike, separation: ArrayLike,
+                 burn_true_anomaly: ArrayLike, initial_mass: ArrayLike, isp: ArrayLike,
+                 thrust: ArrayLike) -> TradeStudyResult:
+        axes = {name: np.atleast_1d(np.asarray(values, dtype=float)) for name, values in
+                zip(self.AXES, (periapsis_altitude, apoapsis_altitude, separation, burn_true_anomaly,
+                                initial_mass, isp, thrust))}
+        periapsis_altitude, apoapsis_altitude, separation, burn_true_anomaly, initial_mass, isp, thrust = (
+            axis.reshape((-1,) + (1,) * (len(axes) - index - 1)) for index, axis in enumerate(axes.values()))
+
+        periapsis_radius = self.body_radius + periapsis_altitude
+        apoapsis_radius = np.where(apoapsis_altitude >= periapsis_altitude, self.body_radius + apoapsis_altitude,
+                                   np.nan)
+        semi_major_axis = (periapsis_radius + apoapsis_radius) / 2.
+        eccentricity = (apoapsis_radius - periapsis_radius) / (apoapsis_radius + periapsis_radius)
+
+        # Same linear phasing guess as the main script, generalized to a burn at any true anomaly:
+        # the along-track drift after one revolution is the period difference times the velocity at the burn point
+        burn_radius = OrbitUtils.orbit_radius_equation(semi_major_axis, eccentricity, burn_true_anomaly)
+        velocity_at_burn = OrbitUtils.live_forces_equation(self.mu, burn_radius, semi_major_axis)
+        keplerian_period = OrbitUtils.keplerian_period_equation(self.mu, semi_major_axis)
+        target_semi_major_axis = OrbitUtils.semi_major_axis_from_period(
+            self.mu, keplerian_period + separation / velocity_at_burn)
+        delta_v = OrbitUtils.live_forces_equation(self.mu, burn_radius, target_semi_major_axis) - velocity_at_burn
+
+        burn_duration = OrbitUtils.rocket_equation_duration_from_delta_v(initial_mass, isp, thrust, delta_v)
+        return TradeStudyResult(axes, target_semi_major_axis, delta_v, burn_duration, keplerian_period)
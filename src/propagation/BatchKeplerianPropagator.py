@@ -0,0 +1,207 @@
+import numpy as np
+from numpy.typing import ArrayLike
+
+from src.propagation.ColumnarEphemeris import ephemeris_dtype
+
+
+def true_to_eccentric_anomaly(true_anomaly: np.ndarray, eccentricity: np.ndarray) -> np.ndarray:
+    return 2. * np.arctan2(np.sqrt(1. - eccentricity) * np.sin(true_anomaly / 2.),
+                           np.sqrt(1. + eccentricity) * np.cos(true_anomaly / 2.))
+
+
+def eccentric_to_true_anomaly(eccentric_anomaly: np.ndarray, eccentricity: np.ndarray) -> np.ndarray:
+    return 2. * np.arctan2(np.sqrt(1. + eccentricity) * np.sin(eccentric_anomaly / 2.),
+                           np.sqrt(1. - eccentricity) * np.cos(eccentric_anomaly / 2.))
+
+
+def mean_to_eccentric_anomaly(mean_anomaly: np.ndarray, eccentricity: np.ndarray, tolerance: float = 1e-14,
+                              max_iterations: int = 50) -> np.ndarray:
+    mean_anomaly = np.remainder(mean_anomaly + np.pi, 2. * np.pi) - np.pi
+    eccentric_anomaly = mean_anomaly + eccentricity * np.sin(mean_anomaly)
+    for _ in range(max_iterations):
+        correction = ((eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly) /
+                      (1. - eccentricity * np.cos(eccentric_anomaly)))
+        eccentric_anomaly = eccentric_anomaly - correction
+        if np.all(np.abs(correction) < tolerance):
+            break
+    return eccentric_anomaly
+
+
+def keplerian_to_cartesian(mu: float, semi_major_axis: np.ndarray, eccentricity: np.ndarray, inclination: np.ndarray,
+                           argument_of_periapsis: np.ndarray, raan: np.ndarray, true_anomaly: np.ndarray):
+    semi_latus_rectum = semi_major_axis * (1. - np.square(eccentricity))
+    cos_f, sin_f = np.cos(true_anomaly), np.sin(true_anomaly)
+    radius = semi_latus_rectum / (1. + eccentricity * cos_f)
+    velocity_factor = np.sqrt(mu / semi_latus_rectum)
+    perifocal_position = (radius * cos_f, radius * sin_f)
+    perifocal_velocity = (-velocity_factor * sin_f, velocity_factor * (eccentricity + cos_f))
+
+    cos_raan, sin_raan = np.cos(raan), np.sin(raan)
+    cos_aop, sin_aop = np.cos(argument_of_periapsis), np.sin(argument_of_periapsis)
+    cos_i, sin_i = np.cos(inclination), np.sin(inclination)
+    p_axis = (cos_raan * cos_aop - sin_raan * sin_aop * cos_i,
+              sin_raan * cos_aop + cos_raan * sin_aop * cos_i,
+              sin_aop * sin_i)
+    q_axis = (-cos_raan * sin_aop - sin_raan * cos_aop * cos_i,
+              -sin_raan * sin_aop + cos_raan * cos_aop * cos_i,
+              cos_aop * sin_i)
+    position = np.stack([perifocal_position[0] * p + perifocal_position[1] * q for p, q in zip(p_axis, q_axis)],
+                        axis=-1)
+    velocity = np.stack([perifocal_velocity[0] * p + perifocal_velocity[1] * q for p, q in zip(p_axis, q_axis)],
+                        axis=-1)
+    return position, velocity
+
+
+class BatchKeplerianPropagator:
+    MOON_J2 = 2.0330530e-4
+    MOON_REFERENCE_RADIUS = 1738000.
+
+    ANOMALY_TYPES = ("TRUE", "MEAN", "ECCENTRIC")
+
+    # Minimum |1 - 5 cos^2(i)| for the short-period map, about 0.7 deg away from the critical inclinations
+    CRITICAL_INCLINATION_MARGIN = 0.05
+
+    def __init__(self, anomaly_type, central_body_mu: float, j2: float = 0.,
+                 reference_radius: float = MOON_REFERENCE_RADIUS, is_short_period_added: bool = False) -> None:
+        self.anomaly_type: str = str(anomaly_type)
+        if self.anomaly_type not in self.ANOMALY_TYPES:
+            raise ValueError("Unsupported anomaly type: {}.".format(anomaly_type))
+        self.central_body_mu: float = central_body_mu
+        self.j2: float = j2
+        self.reference_radius: float = reference_radius
+        self.is_short_period_added: bool = is_short_period_added and j2 != 0.
+
+    def propagate(self, semi_major_axis: ArrayLike, eccentricity: ArrayLike, inclination: ArrayLike,
+                  argument_of_periapsis: ArrayLike, raan: ArrayLike, anomaly: ArrayLike,
+                  times: ArrayLike) -> np.ndarray:
+        elements = np.broadcast_arrays(*(np.atleast_1d(np.asarray(element, dtype=float)) for element in
+                                         (semi_major_axis, eccentricity, inclination, argument_of_periapsis, raan,
+                                          anomaly)))
+        semi_major_axis, eccentricity, inclination, argument_of_periapsis, raan, anomaly = (
+            element[:, np.newaxis] for element in elements)
+        times = np.atleast_1d(np.asarray(times, dtype=float))[np.newaxis, :]
+
+        mean_anomaly = self.to_mean_anomaly(anomaly, eccentricity)
+        if self.is_short_period_added:
+            true_anomaly = eccentric_to_true_anomaly(mean_to_eccentric_anomaly(mean_anomaly, eccentricity),
+                                                     eccentricity)
+            semi_major_axis, eccentricity, inclination, argument_of_periapsis, raan, true_anomaly = (
+                self.map_short_period(semi_major_axis, eccentricity, inclination, argument_of_periapsis, raan,
+                                      true_anomaly, -1.))
+            mean_anomaly = self.to_mean_anomaly(true_anomaly, eccentricity, "TRUE")
+
+        raan_rate, argument_of_periapsis_rate, mean_anomaly_rate = self.secular_rates(semi_major_axis, eccentricity,
+                                                                                      inclination)
+        shape = np.broadcast_shapes(semi_major_axis.shape, times.shape)
+        raan = raan + raan_rate * times
+        argument_of_periapsis = argument_of_periapsis + argument_of_periapsis_rate * times
+        mean_anomaly = mean_anomaly + mean_anomaly_rate * times
+        true_anomaly = eccentric_to_true_anomaly(mean_to_eccentric_anomaly(mean_anomaly, eccentricity), eccentricity)
+
+        if self.is_short_period_added:
+            semi_major_axis, eccentricity, inclination, argument_of_periapsis, raan, true_anomaly = (
+                self.map_short_period(semi_major_axis, eccentricity, inclination, argument_of_periapsis, raan,
+                                      true_anomaly, 1.))
+
+        position, velocity = keplerian_to_cartesian(self.central_body_mu, semi_major_axis, eccentricity, inclination,
+                                                    argument_of_periapsis, raan, true_anomaly)
+        ephemeris = np.empty(shape, dtype=ephemeris_dtype(with_elements=True))
+        ephemeris["t"] = times
+        ephemeris["x"], ephemeris["y"], ephemeris["z"] = np.moveaxis(position, -1, 0)
+        ephemeris["vx"], ephemeris["vy"], ephemeris["vz"] = np.moveaxis(velocity, -1, 0)
+        ephemeris["a"] = semi_major_axis
+        ephemeris["e"] = eccentricity
+        ephemeris["i"] = inclination
+        ephemeris["argument_of_periapsis"] = np.remainder(argument_of_periapsis, 2. * np.pi)
+        ephemeris["raan"] = np.remainder(raan, 2. * np.pi)
+        ephemeris["true_anomaly"] = np.remainder(true_anomaly, 2. * np.pi)
+        return ephemeris
+
+    def to_mean_anomaly(self, anomaly: np.ndarray, eccentricity: np.ndarray, anomaly_type: str = None) -> np.ndarray:
+        anomaly_type = anomaly_type or self.anomaly_type
+        if anomaly_type == "MEAN":
+            return anomaly
+        eccentric_anomaly = anomaly if anomaly_type == "ECCENTRIC" else true_to_eccentric_anomaly(anomaly,
+                                                                                                 eccentricity)
+        return eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly)
+
+    def secular_rates(self, semi_major_axis: np.ndarray, eccentricity: np.ndarray, inclination: np.ndarray):
+        mean_motion = np.sqrt(self.central_body_mu / np.power(semi_major_axis, 3))
+        eta = np.sqrt(1. - np.square(eccentricity))
+        factor = self.j2 * np.square(self.reference_radius / (semi_major_axis * np.square(eta))) * mean_motion
+        cos_i_squared = np.square(np.cos(inclination))
+        raan_rate = -1.5 * factor * np.cos(inclination)
+        argument_of_periapsis_rate = 0.75 * factor * (5. * cos_i_squared - 1.)
+        mean_anomaly_rate = mean_motion + 0.75 * factor * eta * (3. * cos_i_squared - 1.)
+        return raan_rate, argument_of_periapsis_rate, mean_anomaly_rate
+
+    def map_short_period(self, a, e, i, omega, raan, f, sign: float):
+        # First-order Brouwer-Lyddane J2 short-period map: sign = 1 maps mean to osculating, -1 the reverse
+        eccentric_anomaly = true_to_eccentric_anomaly(f, e)
+        mean_anomaly = eccentric_anomaly - e * np.sin(eccentric_anomaly)
+        gamma2 = sign * self.j2 / 2. * np.square(self.reference_radius / a)
+        eta = np.sqrt(1. - np.square(e))
+        gamma2p = gamma2 / np.power(eta, 4)
+        a_r = (1. + e * np.cos(f)) / np.square(eta)
+        cos_i = np.cos(i)
+        cos_i2 = np.square(cos_i)
+        critical = 1. - 5. * cos_i2
+        is_near_critical = np.abs(critical) < self.CRITICAL_INCLINATION_MARGIN
+        if np.any(is_near_critical):
+            raise ValueError("Short-period J2 terms are singular near the critical inclinations (63.43 and 116.57 deg), "
+                             "got {} deg.".format(np.unique(np.degrees(i[is_near_critical]).round(4))))
+        # 1 - 11 cos^2(i) - 40 cos^4(i) / (1 - 5 cos^2(i)) factored by sin^2(i), which keeps the inclination
+        # correction finite for equatorial orbits
+        long_period_factor = (1. - 15. * cos_i2) / critical
+        long_period = (1. - cos_i2) * long_period_factor
+        cos_f = np.cos(f)
+        equation_of_center = f - mean_anomaly + e * np.sin(f)
+        periodic_terms = (3. * np.sin(2. * omega + 2. * f) + 3. * e * np.sin(2. * omega + f) +
+                          e * np.sin(2. * omega + 3. * f))
+
+        a_p = a + a * gamma2 * ((3. * cos_i2 - 1.) * (np.power(a_r, 3) - 1. / np.power(eta, 3)) +
+                                3. * (1. - cos_i2) * np.power(a_r, 3) * np.cos(2. * omega + 2. * f))
+        de1 = (gamma2p / 8. * e * np.square(eta) * long_period *
+               np.cos(2. * omega))
+        de = de1 + np.square(eta) / 2. * (
+            gamma2 * ((3. * cos_i2 - 1.) / np.power(eta, 6) *
+                      (e * eta + e / (1. + eta) + 3. * cos_f + 3. * e * np.square(cos_f) +
+                       np.square(e) * np.power(cos_f, 3)) +
+                      3. * (1. - cos_i2) / np.power(eta, 6) *
+                      (e + 3. * cos_f + 3. * e * np.square(cos_f) + np.square(e) * np.power(cos_f, 3)) *
+                      np.cos(2. * omega + 2. * f)) -
+            gamma2p * (1. - cos_i2) * (3. * np.cos(2. * omega + f) + np.cos(2. * omega + 3. * f)))
+        di = (-gamma2p / 8. * np.square(e) * long_period_factor * np.sin(i) * cos_i * np.cos(2. * omega) +
+              gamma2p / 2. * cos_i * np.sqrt(1. - cos_i2) *
+              (3. * np.cos(2. * omega + 2. * f) + 3. * e * np.cos(2. * omega + f) + e * np.cos(2. * omega + 3. * f)))
+        long_period_cos_i = (11. + 80. * cos_i2 / critical + 200. * np.square(cos_i2) / np.square(critical))
+        d_raan = (-gamma2p / 8. * np.square(e) * cos_i * long_period_cos_i * np.sin(2. * omega) -
+                  gamma2p / 2. * cos_i * (6. * equation_of_center - periodic_terms))
+        mean_longitude = (mean_anomaly + omega + raan +
+                          gamma2p / 8. * np.power(eta, 3) * long_period *
+                          np.sin(2. * omega) -
+                          gamma2p / 16. * (2. + np.square(e) - 11. * (2. + 3. * np.square(e)) * cos_i2 -
+                                           40. * (2. + 5. * np.square(e)) * np.square(cos_i2) / critical -
+                                           400. * np.square(e) * np.power(cos_i2, 3) / np.square(critical)) *
+                          np.sin(2. * omega) +
+                          gamma2p / 4. * (-6. * critical * equation_of_center + (3. - 5. * cos_i2) * periodic_terms) +
+                          d_raan)
+        e_dm = (gamma2p / 8. * e * np.power(eta, 3) * long_period *
+                np.sin(2. * omega) -
+                gamma2p / 4. * np.power(eta, 3) * (
+                    2. * (3. * cos_i2 - 1.) * (np.square(a_r * eta) + a_r + 1.) * np.sin(f) +
+                    3. * (1. - cos_i2) * ((-np.square(a_r * eta) - a_r + 1.) * np.sin(2. * omega + f) +
+                                          (np.square(a_r * eta) + a_r + 1. / 3.) * np.sin(2. * omega + 3. * f))))
+
+        d1 = (e + de) * np.sin(mean_anomaly) + e_dm * np.cos(mean_anomaly)
+        d2 = (e + de) * np.cos(mean_anomaly) - e_dm * np.sin(mean_anomaly)
+        mean_anomaly_p = np.arctan2(d1, d2)
+        e_p = np.sqrt(d1 * d1 + d2 * d2)
+        half_sin_i = np.sin(i / 2.) + np.cos(i / 2.) * di / 2.
+        d3 = half_sin_i * np.sin(raan) + np.sin(i / 2.) * d_raan * np.cos(raan)
+        d4 = half_sin_i * np.cos(raan) - np.sin(i / 2.) * d_raan * np.sin(raan)
+        raan_p = np.arctan2(d3, d4)
+        i_p = 2. * np.arcsin(np.clip(np.sqrt(d3 * d3 + d4 * d4), -1., 1.))
+        omega_p = mean_longitude - mean_anomaly_p - raan_p
+        f_p = eccentric_to_true_anomaly(mean_to_eccentric_anomaly(mean_anomaly_p, e_p), e_p)
+        return a_p, e_p, i_p, omega_p, raan_p, f_p
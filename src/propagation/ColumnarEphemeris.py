@@ -0,0 +1,56 @@
+import numpy as np
+
+STATE_FIELDS = ("t", "x", "y", "z", "vx", "vy", "vz")
+MASS_FIELDS = ("mass",)
+ELEMENT_FIELDS = ("a", "e", "i", "argument_of_periapsis", "raan", "true_anomaly")
+
+
+def ephemeris_dtype(with_mass: bool = False, with_elements: bool = False) -> np.dtype:
+    fields = STATE_FIELDS + (MASS_FIELDS if with_mass else ()) + (ELEMENT_FIELDS if with_elements else ())
+    return np.dtype([(field, np.float64) for field in fields])
+
+
+def positions(ephemeris: np.ndarray) -> np.ndarray:
+    return np.stack((ephemeris["x"], ephemeris["y"], ephemeris["z"]), axis=-1)
+
+
+def velocities(ephemeris: np.ndarray) -> np.ndarray:
+    return np.stack((ephemeris["vx"], ephemeris["vy"], ephemeris["vz"]), axis=-1)
+
+
+class ColumnarEphemeris:
+    DEFAULT_CAPACITY = 1024
+    GROWTH_FACTOR = 2
+
+    def __init__(self, with_mass: bool = False, with_elements: bool = False,
+                 capacity: int = DEFAULT_CAPACITY) -> None:
+        self.dtype: np.dtype = ephemeris_dtype(with_mass, with_elements)
+        self._buffer: np.ndarray = np.empty(max(capacity, 1), dtype=self.dtype)
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buffer)
+
+    def append(self, row: tuple) -> None:
+        if self._size == len(self._buffer):
+            self.reserve(self.GROWTH_FACTOR * len(self._buffer))
+        self._buffer[self._size] = row
+        self._size += 1
+
+    def reserve(self, capacity: int) -> None:
+        if capacity <= len(self._buffer):
+            return
+        buffer = np.empty(capacity, dtype=self.dtype)
+        buffer[:self._size] = self._buffer[:self._size]
+        self._buffer = buffer
+
+    def clear(self) -> None:
+        self._buffer = np.empty(self.DEFAULT_CAPACITY, dtype=self.dtype)
+        self._size = 0
+
+    def to_array(self) -> np.ndarray:
+        return self._buffer[:self._size]
@@ -0,0 +1,178 @@
+from collections import Counter
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from src.propagation.ColumnarEphemeris import positions, velocities
+
+
+def expand_ranges(starts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    owners = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, np.repeat(starts, counts) + offsets
+
+
+def grid_overlap_pairs(lower: np.ndarray, upper: np.ndarray, cell_size: float) -> np.ndarray:
+    if len(lower) < 2:
+        return np.empty((0, 2), dtype=np.int64)
+    # Every box is registered in all the cells it overlaps, so that overlapping boxes share at least one cell
+    first_cells = np.floor(lower / cell_size).astype(np.int64)
+    cell_counts = np.floor(upper / cell_size).astype(np.int64) - first_cells + 1
+    owners, cell_index = expand_ranges(np.zeros(len(lower), dtype=np.int64), np.prod(cell_counts, axis=1))
+    owner_counts = cell_counts[owners]
+    cells = first_cells[owners] + np.stack((cell_index // (owner_counts[:, 1] * owner_counts[:, 2]),
+                                            cell_index // owner_counts[:, 2] % owner_counts[:, 1],
+                                            cell_index % owner_counts[:, 2]), axis=-1)
+    cells -= cells.min(axis=0)
+    shape = cells.max(axis=0) + 1
+    keys = cells @ np.array([shape[1] * shape[2], shape[2], 1])
+    order = np.argsort(keys, kind="stable")
+    sorted_keys, sorted_owners = keys[order], owners[order]
+
+    cell_ends = np.searchsorted(sorted_keys, sorted_keys, side="right")
+    entries, partners = expand_ranges(np.arange(1, len(order) + 1), cell_ends - np.arange(len(order)) - 1)
+    first, second = sorted_owners[entries], sorted_owners[partners]
+    pair_keys = np.unique(np.minimum(first, second) * len(lower) + np.maximum(first, second))
+    return np.stack(np.divmod(pair_keys, len(lower)), axis=-1)
+
+
+def radial_bounds(ephemerides: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if "a" in ephemerides.dtype.names:
+        periapsis = ephemerides["a"] * (1. - ephemerides["e"])
+        apoapsis = ephemerides["a"] * (1. + ephemerides["e"])
+        return periapsis.min(axis=-1), apoapsis.max(axis=-1)
+    radii = np.linalg.norm(positions(ephemerides), axis=-1)
+    return radii.min(axis=-1), radii.max(axis=-1)
+
+
+def overlapping_shells(lower: np.ndarray, upper: np.ndarray, margin: float) -> np.ndarray:
+    order = np.argsort(lower)
+    sorted_lower, sorted_upper = lower[order] - margin, upper[order]
+    previous_upper = np.concatenate(([-np.inf], np.maximum.accumulate(sorted_upper)[:-1]))
+    next_lower = np.concatenate((sorted_lower[1:], [np.inf]))
+    overlapping = np.empty(len(order), dtype=bool)
+    overlapping[order] = (previous_upper >= sorted_lower) | (next_lower <= sorted_upper)
+    return overlapping
+
+
+def hermite_interpolate(start: np.ndarray, start_rate: np.ndarray, end: np.ndarray, end_rate: np.ndarray,
+                        duration: np.ndarray, fraction: np.ndarray) -> np.ndarray:
+    fraction, duration = fraction[..., np.newaxis], duration[..., np.newaxis]
+    squared, cubed = fraction ** 2, fraction ** 3
+    return ((2 * cubed - 3 * squared + 1) * start + (cubed - 2 * squared + fraction) * duration * start_rate +
+            (-2 * cubed + 3 * squared) * end + (cubed - squared) * duration * end_rate)
+
+
+class ConjunctionScreener:
+    ENCOUNTER_DTYPE = np.dtype([("primary", np.int64), ("secondary", np.int64), ("t", np.float64),
+                                ("distance", np.float64)])
+    DEFAULT_BLOCK_SIZE = 16
+    MAX_CELLS_PER_AXIS = 16
+    DATE_TOLERANCE = 1e-9
+
+    def __init__(self, threshold: float, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        self.threshold: float = threshold
+        self.block_size: int = block_size
+        self.statistics: Counter = Counter()
+
+    def screen(self, ephemerides: Union[np.ndarray, Sequence[np.ndarray]]) -> np.ndarray:
+        ephemerides = np.stack(ephemerides) if not isinstance(ephemerides, np.ndarray) else ephemerides
+        times = self.aligned_times(ephemerides)
+        position, velocity = positions(ephemerides), velocities(ephemerides)
+        self.statistics.clear()
+        self.statistics["spacecraft"] = len(ephemerides)
+
+        # Spacecraft whose radial shell never comes within the threshold of another shell cannot have any encounter
+        lower, upper = radial_bounds(ephemerides)
+        active = np.flatnonzero(overlapping_shells(lower, upper, self.threshold))
+        self.statistics["shell_filtered_spacecraft"] = len(ephemerides) - len(active)
+
+        # A closest approach below the threshold between two samples implies a sample within the threshold plus the
+        # distance both spacecraft can travel towards each other over half a step, which each spacecraft contributes
+        steps = np.diff(times)
+        margins = (np.max(np.linalg.norm(velocity, axis=-1), axis=-1) * np.max(steps) / 2 if steps.size
+                   else np.zeros(len(ephemerides)))
+
+        encounters = []
+        for block_start in range(0, len(times), self.block_size):
+            block = slice(block_start, min(block_start + self.block_size, len(times)))
+            pairs = self.block_candidate_pairs(position[active, block], margins[active])
+            pairs = active[pairs]
+            pairs = pairs[(lower[pairs[:, 0]] - self.threshold <= upper[pairs[:, 1]]) &
+                          (lower[pairs[:, 1]] - self.threshold <= upper[pairs[:, 0]])]
+            self.statistics["candidate_pairs"] += len(pairs)
+            encounters.append(self.refine(times, position, velocity, pairs, block, margins))
+
+        encounters = np.concatenate(encounters) if encounters else np.empty(0, dtype=self.ENCOUNTER_DTYPE)
+        self.statistics["encounters"] = len(encounters)
+        return np.sort(encounters, order=["t", "primary", "secondary"])
+
+    def aligned_times(self, ephemerides: np.ndarray) -> np.ndarray:
+        times = ephemerides["t"]
+        if times.size and np.max(np.abs(times - times[:1])) >= self.DATE_TOLERANCE:
+            raise ValueError("Spacecraft ephemerides are not aligned on the same time steps.")
+        return times[0] if len(times) else np.empty(0)
+
+    def block_candidate_pairs(self, block_position: np.ndarray, margins: np.ndarray) -> np.ndarray:
+        # Each spacecraft is reduced to the box bounding its block trajectory, grown by half the threshold and its own
+        # sampling margin, and hashed on a grid sized to the typical box so that a few fast spacecraft do not coarsen it
+        growth = (self.threshold / 2 + margins)[:, np.newaxis]
+        lower, upper = block_position.min(axis=1) - growth, block_position.max(axis=1) + growth
+        extents = np.max(upper - lower, axis=-1)
+        cell_size = max(np.median(extents), extents.max() / self.MAX_CELLS_PER_AXIS) if extents.size else 1.
+        pairs = grid_overlap_pairs(lower, upper, cell_size)
+        self.statistics["grid_pairs"] += len(pairs)
+        overlapping = np.all((lower[pairs[:, 0]] <= upper[pairs[:, 1]]) & (lower[pairs[:, 1]] <= upper[pairs[:, 0]]),
+                             axis=-1)
+        return pairs[overlapping]
+
+    def refine(self, times: np.ndarray, position: np.ndarray, velocity: np.ndarray, pairs: np.ndarray,
+               block: slice, margins: np.ndarray) -> np.ndarray:
+        if not len(pairs):
+            return np.empty(0, dtype=self.ENCOUNTER_DTYPE)
+        # Samples on each side of the block are needed to recognize local minima on the block boundaries
+        window = slice(max(block.start - 1, 0), min(block.stop + 1, len(times)))
+        relative_position = position[pairs[:, 1], window] - position[pairs[:, 0], window]
+        relative_velocity = velocity[pairs[:, 1], window] - velocity[pairs[:, 0], window]
+        distance = np.linalg.norm(relative_position, axis=-1)
+
+        padded = np.pad(distance, ((0, 0), (1, 1)), constant_values=np.inf)
+        is_minimum = (padded[:, 1:-1] <= padded[:, :-2]) & (padded[:, 1:-1] < padded[:, 2:])
+        is_minimum &= distance <= (self.threshold + margins[pairs[:, 0]] + margins[pairs[:, 1]])[:, np.newaxis]
+        is_minimum[:, :block.start - window.start] = False
+        is_minimum[:, block.stop - window.start:] = False
+        pair_index, sample = np.nonzero(is_minimum)
+        self.statistics["refined_minima"] += len(pair_index)
+
+        t, closest_distance = self.closest_approach(times[window], relative_position, relative_velocity,
+                                                    pair_index, sample)
+        below = closest_distance < self.threshold
+        encounters = np.empty(np.count_nonzero(below), dtype=self.ENCOUNTER_DTYPE)
+        encounters["primary"], encounters["secondary"] = pairs[pair_index[below]].T
+        encounters["t"], encounters["distance"] = t[below], closest_distance[below]
+        return encounters
+
+    def closest_approach(self, times: np.ndarray, relative_position: np.ndarray, relative_velocity: np.ndarray,
+                         pair_index: np.ndarray, sample: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # The linear relative motion at the sampled minimum gives the closest approach offset, which is then evaluated
+        # on the cubic Hermite interpolant of the interval it falls in
+        r, v = relative_position[pair_index, sample], relative_velocity[pair_index, sample]
+        speed_squared = np.sum(v * v, axis=-1)
+        offset = np.divide(-np.sum(r * v, axis=-1), speed_squared, out=np.zeros_like(speed_squared),
+                           where=speed_squared > 0.)
+        previous_sample, next_sample = np.maximum(sample - 1, 0), np.minimum(sample + 1, len(times) - 1)
+        offset = np.clip(offset, times[previous_sample] - times[sample], times[next_sample] - times[sample])
+
+        start = np.where(offset < 0., previous_sample, sample)
+        end = np.where(offset < 0., sample, next_sample)
+        duration = times[end] - times[start]
+        fraction = np.divide(times[sample] + offset - times[start], duration, out=np.zeros_like(duration),
+                             where=duration > 0.)
+        interpolated = hermite_interpolate(relative_position[pair_index, start], relative_velocity[pair_index, start],
+                                           relative_position[pair_index, end], relative_velocity[pair_index, end],
+                                           duration, fraction)
+        closest_distance = np.linalg.norm(interpolated, axis=-1)
+        sampled_distance = np.linalg.norm(r, axis=-1)
+        is_sample_closer = sampled_distance < closest_distance
+        return (times[sample] + np.where(is_sample_closer, 0., offset),
+                np.where(is_sample_closer, sampled_distance, closest_distance))
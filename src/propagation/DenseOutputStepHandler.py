@@ -0,0 +1,46 @@
+from typing import List, Optional
+
+import numpy as np
+from org.orekit.propagation import SpacecraftState
+from org.orekit.propagation.sampling import OrekitStepInterpolator, PythonOrekitStepHandler
+from org.orekit.time import AbsoluteDate
+
+from src.propagation.PolynomialEphemeris import PolynomialEphemeris, chebyshev_nodes
+
+
+class DenseOutputStepHandler(PythonOrekitStepHandler):
+    def __init__(self, reference_epoch: Optional[AbsoluteDate] = None, degree: int = 10):
+        super(DenseOutputStepHandler, self).__init__()
+        self.reference_epoch: Optional[AbsoluteDate] = reference_epoch
+        self.nodes: np.ndarray = chebyshev_nodes(degree + 1)
+        self.segment_starts: List[float] = []
+        self.segment_ends: List[float] = []
+        self.node_values: List[np.ndarray] = []
+
+    @property
+    def ephemeris(self) -> PolynomialEphemeris:
+        return PolynomialEphemeris.fit(self.segment_starts, self.segment_ends, self.node_values)
+
+    def init(self, initial_state: SpacecraftState, t: AbsoluteDate):
+        if self.reference_epoch is None:
+            self.reference_epoch = initial_state.getDate()
+
+    def handleStep(self, interpolator: OrekitStepInterpolator):
+        previous_date = interpolator.getPreviousState().getDate()
+        duration = interpolator.getCurrentState().getDate().durationFrom(previous_date)
+        if duration == 0.:
+            return
+        start = previous_date.durationFrom(self.reference_epoch)
+        fractions = (1. + self.nodes) / 2. if duration >= 0. else (1. - self.nodes) / 2.
+        values = np.empty((len(self.nodes), len(PolynomialEphemeris.COMPONENTS)))
+        for index, fraction in enumerate(fractions):
+            pv = interpolator.getInterpolatedState(previous_date.shiftedBy(float(fraction * duration))).getPVCoordinates()
+            position, velocity = pv.getPosition(), pv.getVelocity()
+            values[index] = (position.getX(), position.getY(), position.getZ(),
+                             velocity.getX(), velocity.getY(), velocity.getZ())
+        self.segment_starts.append(min(start, start + duration))
+        self.segment_ends.append(max(start, start + duration))
+        self.node_values.append(values)
+
+    def finish(self, final_state: SpacecraftState):
+        pass
@@ -0,0 +1,58 @@
+import numpy as np
+
+from src.propagation.ColumnarEphemeris import positions, velocities
+
+
+def relative_positions(ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray) -> np.ndarray:
+    return positions(ephemeris_secondary) - positions(ephemeris_primary)
+
+
+def relative_distance(ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray) -> np.ndarray:
+    return np.linalg.norm(relative_positions(ephemeris_primary, ephemeris_secondary), axis=-1)
+
+
+def ric_frame(ephemeris: np.ndarray) -> np.ndarray:
+    position = positions(ephemeris)
+    velocity = velocities(ephemeris)
+    radial = position / np.linalg.norm(position, axis=-1, keepdims=True)
+    momentum = np.cross(position, velocity)
+    cross_track = momentum / np.linalg.norm(momentum, axis=-1, keepdims=True)
+    in_track = np.cross(cross_track, radial)
+    return np.stack((radial, in_track, cross_track), axis=-2)
+
+
+def relative_ric_components(ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray) -> np.ndarray:
+    return np.einsum("...ij,...j->...i", ric_frame(ephemeris_primary),
+                     relative_positions(ephemeris_primary, ephemeris_secondary))
+
+
+def elapsed_time(ephemeris: np.ndarray, time_origin: float = 0.) -> np.ndarray:
+    return ephemeris["t"] - time_origin
+
+
+def time_misalignment(ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray) -> np.ndarray:
+    if len(ephemeris_primary) != len(ephemeris_secondary):
+        raise ValueError(
+            "Primary and secondary object ephemeris size mismatch: {} vs {}.".format(len(ephemeris_primary),
+                                                                                     len(ephemeris_secondary)))
+    return np.abs(ephemeris_primary["t"] - ephemeris_secondary["t"])
+
+
+def check_time_alignment(ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray, tolerance: float) -> None:
+    misaligned = np.flatnonzero(time_misalignment(ephemeris_primary, ephemeris_secondary) >= tolerance)
+    if misaligned.size:
+        index = misaligned[0]
+        raise ValueError("Time step mismatch at index {}: {} vs {}.".format(
+            index, ephemeris_primary["t"][index], ephemeris_secondary["t"][index]
+        ))
+
+
+def first_crossing_time(times: np.ndarray, values: np.ndarray, threshold: float) -> float:
+    crossings = np.flatnonzero((values[:-1] < threshold) & (values[1:] >= threshold))
+    if values.size and values[0] >= threshold:
+        return float(times[0])
+    if not crossings.size:
+        return np.nan
+    index = crossings[0]
+    fraction = (threshold - values[index]) / (values[index + 1] - values[index])
+    return float(times[index] + fraction * (times[index + 1] - times[index]))
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+from org.orekit.orbits import KeplerianOrbit, Orbit, OrbitType
+from org.orekit.time import AbsoluteDate
+
+from data import OrekitInitializer
+from src.propagation.PropagatorFactory import PropagatorFactory
+
+
+def data_fingerprint(data_path: str) -> Dict[str, object]:
+    if os.path.isdir(data_path):
+        files = [os.path.join(root, name) for root, _, names in os.walk(data_path) for name in names]
+        statuses = [os.stat(path) for path in files]
+        return {"path": os.path.abspath(data_path), "files": len(statuses),
+                "size": sum(status.st_size for status in statuses),
+                "mtime_ns": max((status.st_mtime_ns for status in statuses), default=0)}
+    status = os.stat(data_path)
+    return {"path": os.path.abspath(data_path), "size": status.st_size, "mtime_ns": status.st_mtime_ns}
+
+
+def orbit_fingerprint(orbit: Orbit) -> Dict[str, object]:
+    keplerian_orbit = KeplerianOrbit.cast_(OrbitType.KEPLERIAN.convertType(orbit))
+    return {"epoch": keplerian_orbit.getDate().durationFrom(AbsoluteDate.J2000_EPOCH),
+            "frame": keplerian_orbit.getFrame().getName(),
+            "mu": keplerian_orbit.getMu(),
+            "elements": [keplerian_orbit.getA(), keplerian_orbit.getE(), keplerian_orbit.getI(),
+                         keplerian_orbit.getPerigeeArgument(), keplerian_orbit.getRightAscensionOfAscendingNode(),
+                         keplerian_orbit.getTrueAnomaly()]}
+
+
+class EphemerisCache:
+    DEFAULT_MAX_BYTES = 1024 ** 3
+    EPHEMERIS_EXTENSION = ".npy"
+    METADATA_EXTENSION = ".json"
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 data_path: str = OrekitInitializer.DEFAULT_DATA_PATH) -> None:
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.data_fingerprint: Dict[str, object] = data_fingerprint(data_path)
+        os.makedirs(directory, exist_ok=True)
+
+    def propagate(self, propagator_factory: PropagatorFactory, initial_orbit: Orbit, start: AbsoluteDate,
+                  end: AbsoluteDate, step: float = PropagatorFactory.DEFAULT_HANDLER_STEP, record_mass: bool = False,
+                  record_elements: bool = False) -> np.ndarray:
+        return self.propagate_formation(propagator_factory, [initial_orbit], start, end, step, record_mass,
+                                        record_elements)[0]
+
+    def propagate_formation(self, propagator_factory: PropagatorFactory, initial_orbits: List[Orbit],
+                            start: AbsoluteDate, end: AbsoluteDate, step: float = PropagatorFactory.DEFAULT_HANDLER_STEP,
+                            record_mass: bool = False, record_elements: bool = False) -> List[np.ndarray]:
+        keys = [self.key(propagator_factory, initial_orbit, start, end, step, record_mass, record_elements)
+                for initial_orbit in initial_orbits]
+        ephemerides = [self.load(key) for key in keys]
+        if any(ephemeris is None for ephemeris in ephemerides):
+            # The whole formation is propagated again so that its ephemerides stay on the same step grid
+            ephemerides = propagator_factory.propagate_formation(initial_orbits, start, end, step, record_mass,
+                                                                 record_elements)
+            for key, ephemeris in zip(keys, ephemerides):
+                self.store(key, ephemeris)
+        return ephemerides
+
+    def key(self, propagator_factory: PropagatorFactory, initial_orbit: Orbit, start: AbsoluteDate,
+            end: AbsoluteDate, step: float, record_mass: bool = False, record_elements: bool = False) -> str:
+        description = {"orbit": orbit_fingerprint(initial_orbit),
+                       "propagator": propagator_factory.configuration(),
+                       "sampling": {"start": start.durationFrom(AbsoluteDate.J2000_EPOCH),
+                                    "end": end.durationFrom(AbsoluteDate.J2000_EPOCH),
+                                    "step": step, "record_mass": record_mass, "record_elements": record_elements},
+                       "data": self.data_fingerprint}
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def load(self, key: str) -> Optional[np.memmap]:
+        path = self.ephemeris_path(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)
+        return np.load(path, mmap_mode="r")
+
+    def store(self, key: str, ephemeris: np.ndarray) -> None:
+        temporary_path = self.ephemeris_path(key) + ".tmp"
+        with open(temporary_path, "wb") as ephemeris_file:
+            np.save(ephemeris_file, np.ascontiguousarray(ephemeris))
+        with open(self.metadata_path(key), "w") as metadata_file:
+            json.dump({"data": self.data_fingerprint}, metadata_file)
+        os.replace(temporary_path, self.ephemeris_path(key))
+        self.evict()
+
+    def evict(self) -> List[str]:
+        entries = sorted(self.entries(), key=lambda key: os.stat(self.ephemeris_path(key)).st_mtime_ns)
+        total_bytes = sum(self.entry_size(key) for key in entries)
+        evicted = []
+        for key in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= self.entry_size(key)
+            self.remove(key)
+            evicted.append(key)
+        return evicted
+
+    def invalidate_stale(self) -> List[str]:
+        stale = []
+        for key in self.entries():
+            try:
+                with open(self.metadata_path(key)) as metadata_file:
+                    is_stale = json.load(metadata_file)["data"] != self.data_fingerprint
+            except (OSError, ValueError, KeyError):
+                is_stale = True
+            if is_stale:
+                self.remove(key)
+                stale.append(key)
+        return stale
+
+    def clear(self) -> None:
+        for key in self.entries():
+            self.remove(key)
+
+    def entries(self) -> List[str]:
+        return [name[:-len(self.EPHEMERIS_EXTENSION)] for name in os.listdir(self.directory)
+                if name.endswith(self.EPHEMERIS_EXTENSION)]
+
+    def entry_size(self, key: str) -> int:
+        metadata_path = self.metadata_path(key)
+        metadata_size = os.path.getsize(metadata_path) if os.path.exists(metadata_path) else 0
+        return os.path.getsize(self.ephemeris_path(key)) + metadata_size
+
+    def remove(self, key: str) -> None:
+        for path in (self.ephemeris_path(key), self.metadata_path(key)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def ephemeris_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.EPHEMERIS_EXTENSION)
+
+    def metadata_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.METADATA_EXTENSION)
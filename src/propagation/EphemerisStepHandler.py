@@ -1,20 +1,60 @@
-from typing import List
+import time
+from typing import List, Optional
 
+import numpy as np
+from org.orekit.orbits import KeplerianOrbit, OrbitType
 from org.orekit.propagation import SpacecraftState
 from org.orekit.propagation.sampling import PythonOrekitFixedStepHandler
 from org.orekit.time import AbsoluteDate
 
+from src.propagation.ColumnarEphemeris import ColumnarEphemeris
+from src.propagation.PropagationInstrumentation import PropagationInstrumentation
+
 
 class EphemerisStepHandler(PythonOrekitFixedStepHandler):
-    def __init__(self):
+    def __init__(self, reference_epoch: Optional[AbsoluteDate] = None, record_mass: bool = False,
+                 record_elements: bool = False, keep_states: bool = False,
+                 expected_size: int = ColumnarEphemeris.DEFAULT_CAPACITY,
+                 instrumentation: Optional[PropagationInstrumentation] = None):
         super(EphemerisStepHandler,self).__init__()
-        self.states:List[SpacecraftState] = []
+        self.reference_epoch: Optional[AbsoluteDate] = reference_epoch
+        self.record_mass: bool = record_mass
+        self.record_elements: bool = record_elements
+        self.columns: ColumnarEphemeris = ColumnarEphemeris(record_mass, record_elements, expected_size)
+        self.states: Optional[List[SpacecraftState]] = [] if keep_states else None
+        self.instrumentation: Optional[PropagationInstrumentation] = instrumentation
+
+    @property
+    def ephemeris(self) -> np.ndarray:
+        return self.columns.to_array()
 
     def init(self, initial_state:SpacecraftState, t:AbsoluteDate, step: float):
-        pass
+        if self.reference_epoch is None:
+            self.reference_epoch = initial_state.getDate()
+        expected_size = int(abs(t.durationFrom(initial_state.getDate())) / step) + 1
+        self.columns.reserve(len(self.columns) + expected_size)
 
     def handleStep(self, current_state:SpacecraftState):
-        self.states.append(current_state)
+        start = self.instrumentation and time.perf_counter()
+        self.columns.append(self.extract_row(current_state))
+        if self.states is not None:
+            self.states.append(current_state)
+        self.instrumentation and self.instrumentation.record_callback("ephemeris_step_handler", start)
 
     def finish(self, final_state: SpacecraftState):
-        pass
\ No newline at end of file
+        pass
+
+    def extract_row(self, state: SpacecraftState) -> tuple:
+        pv = state.getPVCoordinates()
+        position = pv.getPosition()
+        velocity = pv.getVelocity()
+        row = (state.getDate().durationFrom(self.reference_epoch),
+               position.getX(), position.getY(), position.getZ(),
+               velocity.getX(), velocity.getY(), velocity.getZ())
+        if self.record_mass:
+            row += (state.getMass(),)
+        if self.record_elements:
+            orbit = KeplerianOrbit.cast_(OrbitType.KEPLERIAN.convertType(state.getOrbit()))
+            row += (orbit.getA(), orbit.getE(), orbit.getI(), orbit.getPerigeeArgument(),
+                    orbit.getRightAscensionOfAscendingNode(), orbit.getTrueAnomaly())
+        return row
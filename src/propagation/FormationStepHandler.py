@@ -0,0 +1,38 @@
+from typing import List, Optional
+
+import numpy as np
+from org.orekit.propagation import SpacecraftState
+from org.orekit.propagation.sampling import PythonMultiSatFixedStepHandler
+from org.orekit.time import AbsoluteDate
+
+from src.propagation.EphemerisStepHandler import EphemerisStepHandler
+from src.propagation.PropagationInstrumentation import PropagationInstrumentation
+
+
+class FormationStepHandler(PythonMultiSatFixedStepHandler):
+    def __init__(self, spacecraft_number: int, reference_epoch: Optional[AbsoluteDate] = None,
+                 record_mass: bool = False, record_elements: bool = False,
+                 instrumentation: Optional[PropagationInstrumentation] = None):
+        super(FormationStepHandler, self).__init__()
+        self.handlers: List[EphemerisStepHandler] = [
+            EphemerisStepHandler(reference_epoch, record_mass, record_elements, instrumentation=instrumentation)
+            for _ in range(spacecraft_number)]
+
+    @property
+    def ephemerides(self) -> List[np.ndarray]:
+        return [handler.ephemeris for handler in self.handlers]
+
+    def init(self, initial_states, t: AbsoluteDate, step: float):
+        for handler, state in zip(self.handlers, self.to_states(initial_states)):
+            handler.init(state, t, step)
+
+    def handleStep(self, states):
+        for handler, state in zip(self.handlers, self.to_states(states)):
+            handler.handleStep(state)
+
+    def finish(self, final_states):
+        for handler, state in zip(self.handlers, self.to_states(final_states)):
+            handler.finish(state)
+
+    def to_states(self, states) -> List[SpacecraftState]:
+        return [SpacecraftState.cast_(states.get(index)) for index in range(states.size())]
@@ -0,0 +1,44 @@
+import time
+
+from org.orekit.forces import ForceModel, PythonForceModel
+from org.orekit.propagation import SpacecraftState
+from org.orekit.time import AbsoluteDate
+
+from src.propagation.PropagationInstrumentation import PropagationInstrumentation
+
+
+class InstrumentedForceModel(PythonForceModel):
+    def __init__(self, name: str, force_model: ForceModel, instrumentation: PropagationInstrumentation):
+        super(InstrumentedForceModel, self).__init__()
+        self.name: str = name
+        self.force_model: ForceModel = force_model
+        self.instrumentation: PropagationInstrumentation = instrumentation
+
+    def init(self, initial_state: SpacecraftState, target: AbsoluteDate):
+        self.force_model.init(initial_state, target)
+
+    def acceleration(self, state, parameters):
+        start = time.perf_counter()
+        try:
+            return self.force_model.acceleration(state, parameters)
+        finally:
+            self.instrumentation.record_force_evaluation(self.name, start)
+
+    def acceleration_FT(self, state, parameters):
+        start = time.perf_counter()
+        try:
+            return self.force_model.acceleration(state, parameters)
+        finally:
+            self.instrumentation.record_force_evaluation(self.name, start)
+
+    def dependsOnPositionOnly(self):
+        return self.force_model.dependsOnPositionOnly()
+
+    def getParametersDrivers(self):
+        return self.force_model.getParametersDrivers()
+
+    def getEventDetectors(self):
+        return self.force_model.getEventDetectors()
+
+    def getFieldEventDetectors(self, field):
+        return self.force_model.getFieldEventDetectors(field)
@@ -0,0 +1,31 @@
+import time
+
+from org.hipparchus.ode import ODEIntegrator
+from org.orekit.propagation import SpacecraftState
+from org.orekit.propagation.sampling import OrekitStepInterpolator, PythonOrekitStepHandler
+from org.orekit.time import AbsoluteDate
+
+from src.propagation.PropagationInstrumentation import PropagationInstrumentation
+
+
+class IntegratorStepRecorder(PythonOrekitStepHandler):
+    def __init__(self, integrator: ODEIntegrator, instrumentation: PropagationInstrumentation):
+        super(IntegratorStepRecorder, self).__init__()
+        self.integrator: ODEIntegrator = integrator
+        self.instrumentation: PropagationInstrumentation = instrumentation
+        self.accepted_steps: int = 0
+        self.last_step_end: float = 0.
+
+    def init(self, initial_state: SpacecraftState, t: AbsoluteDate):
+        self.accepted_steps = 0
+        self.last_step_end = time.perf_counter()
+
+    def handleStep(self, interpolator: OrekitStepInterpolator):
+        step_end = time.perf_counter()
+        step_size = interpolator.getCurrentState().getDate().durationFrom(interpolator.getPreviousState().getDate())
+        self.instrumentation.record_step(abs(step_size), self.last_step_end, step_end)
+        self.accepted_steps += 1
+        self.last_step_end = step_end
+
+    def finish(self, final_state: SpacecraftState):
+        self.instrumentation.record_integration(self.integrator.getEvaluations(), self.accepted_steps)
@@ -0,0 +1,87 @@
+import numpy as np
+from numpy.typing import ArrayLike
+
+from src.propagation.ColumnarEphemeris import ephemeris_dtype, STATE_FIELDS
+
+
+def chebyshev_nodes(node_number: int) -> np.ndarray:
+    return np.cos(np.pi * (np.arange(node_number) + 0.5) / node_number)
+
+
+class PolynomialEphemeris:
+    COMPONENTS = STATE_FIELDS[1:]
+    DEFAULT_SAMPLES_PER_SEGMENT = 8
+
+    def __init__(self, segment_starts: np.ndarray, segment_ends: np.ndarray, coefficients: np.ndarray) -> None:
+        order = np.argsort(segment_starts)
+        self.segment_starts: np.ndarray = np.asarray(segment_starts, dtype=float)[order]
+        self.segment_ends: np.ndarray = np.asarray(segment_ends, dtype=float)[order]
+        self.coefficients: np.ndarray = np.asarray(coefficients, dtype=float)[order]
+
+    @classmethod
+    def fit(cls, segment_starts: ArrayLike, segment_ends: ArrayLike, node_values: ArrayLike) -> "PolynomialEphemeris":
+        node_values = np.asarray(node_values, dtype=float)
+        node_number = node_values.shape[1]
+        degrees = np.arange(node_number)
+        basis = np.cos(np.pi * np.outer(degrees, np.arange(node_number) + 0.5) / node_number) * 2. / node_number
+        basis[0] /= 2.
+        return cls(segment_starts, segment_ends, np.einsum("jk,skc->sjc", basis, node_values))
+
+    @classmethod
+    def load(cls, path: str) -> "PolynomialEphemeris":
+        with np.load(path) as archive:
+            return cls(archive["segment_starts"], archive["segment_ends"], archive["coefficients"])
+
+    def save(self, path: str) -> None:
+        np.savez(path, segment_starts=self.segment_starts, segment_ends=self.segment_ends,
+                 coefficients=self.coefficients)
+
+    @property
+    def start(self) -> float:
+        return float(self.segment_starts[0])
+
+    @property
+    def end(self) -> float:
+        return float(self.segment_ends[-1])
+
+    def evaluate(self, times: ArrayLike) -> np.ndarray:
+        times = np.asarray(times, dtype=float)
+        if np.any(times < self.start - 1e-9) or np.any(times > self.end + 1e-9):
+            raise ValueError("Requested epochs are outside of the ephemeris span [{}, {}].".format(self.start,
+                                                                                                 self.end))
+        segments = np.clip(np.searchsorted(self.segment_starts, times, side="right") - 1, 0,
+                           len(self.segment_starts) - 1)
+        starts, ends = self.segment_starts[segments], self.segment_ends[segments]
+        normalized_times = ((2. * times - starts - ends) / (ends - starts))[..., np.newaxis]
+
+        # Clenshaw recurrence, vectorized over the requested epochs with each epoch using its own segment coefficients
+        coefficients = self.coefficients[segments]
+        next_term = np.zeros(coefficients.shape[:-2] + coefficients.shape[-1:])
+        second_next_term = np.zeros_like(next_term)
+        for degree in range(coefficients.shape[-2] - 1, 0, -1):
+            next_term, second_next_term = (2. * normalized_times * next_term - second_next_term +
+                                           coefficients[..., degree, :], next_term)
+        values = normalized_times * next_term - second_next_term + coefficients[..., 0, :]
+
+        ephemeris = np.empty(times.shape, dtype=ephemeris_dtype())
+        ephemeris["t"] = times
+        for index, component in enumerate(self.COMPONENTS):
+            ephemeris[component] = values[..., index]
+        return ephemeris
+
+    def adaptive_times(self, arc_length: float,
+                       samples_per_segment: int = DEFAULT_SAMPLES_PER_SEGMENT) -> np.ndarray:
+        # Integrator steps are already short where the dynamics are fast, so sub-sampling each of them gives a
+        # fine grid on which the travelled distance is integrated and then split in equal arc lengths
+        fractions = np.linspace(0., 1., samples_per_segment, endpoint=False)
+        fine_times = np.append((self.segment_starts[:, np.newaxis] +
+                                fractions * (self.segment_ends - self.segment_starts)[:, np.newaxis]).ravel(),
+                               self.end)
+        fine_ephemeris = self.evaluate(fine_times)
+        speed = np.sqrt(fine_ephemeris["vx"] ** 2 + fine_ephemeris["vy"] ** 2 + fine_ephemeris["vz"] ** 2)
+        travelled_distance = np.concatenate(([0.], np.cumsum(np.diff(fine_times) * (speed[1:] + speed[:-1]) / 2.)))
+        sample_number = max(int(np.ceil(travelled_distance[-1] / arc_length)), 1) + 1
+        return np.interp(np.linspace(0., travelled_distance[-1], sample_number), travelled_distance, fine_times)
+
+    def resample_adaptively(self, arc_length: float) -> np.ndarray:
+        return self.evaluate(self.adaptive_times(arc_length))
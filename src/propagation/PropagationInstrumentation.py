@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+
+import numpy as np
+
+
+class PropagationInstrumentation:
+    # DormandPrince853 has 16 stages and needs 15 new derivative evaluations per attempted step (first same as last),
+    # plus the initial derivatives and the initial step size estimation
+    EVALUATIONS_PER_STEP = 15
+    INITIAL_EVALUATIONS = 2
+    STEP_SIZE_BIN_EDGES = np.logspace(-1., 4., 11)
+    LATENCY_BIN_EDGES = np.logspace(-7., -1., 13)
+    LATENCY_PERCENTILES = (50., 95., 99.)
+    MAX_TRACE_EVENTS = 1000000
+    MICROSECOND = 1e6
+
+    def __init__(self, max_trace_events: int = MAX_TRACE_EVENTS) -> None:
+        self.origin: float = time.perf_counter()
+        self.max_trace_events: int = max_trace_events
+        self.counters: Counter = Counter()
+        self.durations: Dict[str, float] = defaultdict(float)
+        self.step_sizes: List[float] = []
+        self.callback_latencies: Dict[str, List[float]] = defaultdict(list)
+        self.trace_events: List[dict] = []
+        self.lock: threading.Lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "propagation"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.durations[name] += end - start
+                self.add_trace_event(name, category, start, end)
+
+    def record_step(self, step_size: float, start: float, end: float) -> None:
+        with self.lock:
+            self.counters["integrator.accepted_steps"] += 1
+            self.step_sizes.append(step_size)
+            self.add_trace_event("integrator_step", "integrator", start, end, {"step_size": step_size})
+
+    def record_integration(self, evaluations: int, accepted_steps: int) -> None:
+        attempted_steps = round((evaluations - self.INITIAL_EVALUATIONS) / self.EVALUATIONS_PER_STEP)
+        with self.lock:
+            self.counters["integrator.integrations"] += 1
+            self.counters["integrator.evaluations"] += evaluations
+            self.counters["integrator.estimated_rejected_steps"] += max(attempted_steps - accepted_steps, 0)
+
+    def record_force_evaluation(self, name: str, start: float) -> None:
+        duration = time.perf_counter() - start
+        with self.lock:
+            self.counters["force_model.{}.evaluations".format(name)] += 1
+            self.durations["force_model.{}".format(name)] += duration
+
+    def record_callback(self, name: str, start: float) -> None:
+        end = time.perf_counter()
+        with self.lock:
+            self.counters["callback.{}.calls".format(name)] += 1
+            self.durations["callback.{}".format(name)] += end - start
+            self.callback_latencies[name].append(end - start)
+            self.add_trace_event(name, "callback", start, end)
+
+    def add_trace_event(self, name: str, category: str, start: float, end: float, arguments: dict = None) -> None:
+        if len(self.trace_events) >= self.max_trace_events:
+            self.counters["trace.dropped_events"] += 1
+            return
+        event = {"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                 "ts": (start - self.origin) * self.MICROSECOND, "dur": (end - start) * self.MICROSECOND}
+        if arguments:
+            event["args"] = arguments
+        self.trace_events.append(event)
+
+    def histogram(self, values: List[float], bin_edges: np.ndarray) -> Dict[str, list]:
+        counts, _ = np.histogram(np.clip(values, bin_edges[0], bin_edges[-1]), bin_edges)
+        return {"bin_edges": bin_edges.tolist(), "counts": counts.tolist()}
+
+    def report(self) -> Dict[str, object]:
+        with self.lock:
+            step_sizes = np.asarray(self.step_sizes)
+            report = {"counters": dict(self.counters), "durations": dict(self.durations),
+                      "step_size": {"count": int(step_sizes.size)}, "callbacks": {}}
+            if step_sizes.size:
+                report["step_size"].update(min=float(step_sizes.min()), mean=float(step_sizes.mean()),
+                                           max=float(step_sizes.max()),
+                                           histogram=self.histogram(step_sizes, self.STEP_SIZE_BIN_EDGES))
+            for name, latencies in self.callback_latencies.items():
+                latencies = np.asarray(latencies)
+                report["callbacks"][name] = dict(
+                    count=int(latencies.size), mean=float(latencies.mean()), max=float(latencies.max()),
+                    histogram=self.histogram(latencies, self.LATENCY_BIN_EDGES),
+                    **{"p{:g}".format(percentile): float(value) for percentile, value in
+                       zip(self.LATENCY_PERCENTILES, np.percentile(latencies, self.LATENCY_PERCENTILES))})
+        return report
+
+    def save_report(self, path: str) -> None:
+        with open(path, "w") as report_file:
+            json.dump(self.report(), report_file, indent=4)
+
+    def save_trace(self, path: str) -> None:
+        # Chrome trace event format, readable by chrome://tracing and Perfetto
+        with self.lock:
+            trace = {"traceEvents": list(self.trace_events), "displayTimeUnit": "ms"}
+        with open(path, "w") as trace_file:
+            json.dump(trace, trace_file)
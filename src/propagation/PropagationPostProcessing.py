@@ -1,43 +1,68 @@
+import os
+from typing import Optional
+
 import numpy as np
-import matplotlib.pyplot as plt
-from org.orekit.propagation import SpacecraftState
-from typing import List
 from org.orekit.utils import Constants
 
 from org.orekit.time import AbsoluteDate
 
+from src.propagation import EphemerisAnalysis
+from src.propagation.ColumnarEphemeris import positions
+
 class PropagationPostProcessing:
     DATE_TOLERANCE = 1e-9
     HOUR = 3600.
     KILOMETER_TO_METER = 1000.
+    RELATIVE_MOTION_DTYPE = np.dtype([("elapsed_time", np.float64), ("distance", np.float64), ("ric", np.float64, (3,))])
+    RELATIVE_DISTANCE_PLOT_NAME = "relative_distance.png"
+    TRAJECTORIES_PLOT_NAME = "trajectories_3d.png"
 
     def __init__(self, initial_epoch: AbsoluteDate):
         self.initial_epoch = initial_epoch
 
-    def post_process(self, states_primary: List[SpacecraftState], states_secondary: List[SpacecraftState]):
-        self.check_time_steps(states_primary, states_secondary)
+    def post_process(self, ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray,
+                     check_time_steps: bool = False, output_directory: Optional[str] = None,
+                     is_plotted: bool = True) -> np.ndarray:
+        check_time_steps and self.check_time_steps(ephemeris_primary, ephemeris_secondary)
+        relative_motion = self.compute_relative_motion(ephemeris_primary, ephemeris_secondary)
+        print("Final achieved relative distance = ", relative_motion["distance"][-1] / self.KILOMETER_TO_METER, "km")
+        if not is_plotted:
+            return relative_motion
 
         print("\nDisplaying relative distance vs time plot...")
-        self.plot_relative_distance_vs_time(states_primary, states_secondary)
+        self.plot_relative_distance_vs_time(relative_motion,
+                                            self.plot_path(output_directory, self.RELATIVE_DISTANCE_PLOT_NAME))
 
         print("\nDisplaying 3D trajectories plot...")
-        self.plot_3d_trajectories_with_moon(states_primary, states_secondary)
-
-    def extract_positions(self, states_primary: List[SpacecraftState]):
-        x_values = [(state.getPosition().getX() / self.KILOMETER_TO_METER) for state in states_primary]
-        y_values = [(state.getPosition().getY() / self.KILOMETER_TO_METER) for state in states_primary]
-        z_values = [(state.getPosition().getZ() / self.KILOMETER_TO_METER) for state in states_primary]
-        return x_values, y_values, z_values
-
-    def plot_relative_distance_vs_time(self, states_primary, states_secondary):
-        states_difference = [(state1.getDate(), self.compute_relative_distance(state1, state2)) for state1, state2 in
-                             zip(states_primary, states_secondary) if self.check_time_step(state1, state2)]
-
-        elapsed_time = [(date.durationFrom(self.initial_epoch) / self.HOUR) for date, _ in states_difference]
-        relative_distances = [(relative_distance / self.KILOMETER_TO_METER) for _, relative_distance in
-                              states_difference]
-
-        print("Final achieved relative distance = ", relative_distances[-1], "km")
+        self.plot_3d_trajectories_with_moon(ephemeris_primary, ephemeris_secondary,
+                                            self.plot_path(output_directory, self.TRAJECTORIES_PLOT_NAME))
+        return relative_motion
+
+    def plot_path(self, output_directory: Optional[str], name: str) -> Optional[str]:
+        return None if output_directory is None else os.path.join(output_directory, name)
+
+    def show_or_save(self, plt, output_path: Optional[str]):
+        if output_path is None:
+            plt.show()
+        else:
+            plt.savefig(output_path)
+            plt.close()
+
+    def extract_positions(self, ephemeris: np.ndarray):
+        position = positions(ephemeris) / self.KILOMETER_TO_METER
+        return position[:, 0], position[:, 1], position[:, 2]
+
+    def compute_relative_motion(self, ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray) -> np.ndarray:
+        relative_motion = np.empty(len(ephemeris_primary), dtype=self.RELATIVE_MOTION_DTYPE)
+        relative_motion["elapsed_time"] = EphemerisAnalysis.elapsed_time(ephemeris_primary)
+        relative_motion["distance"] = EphemerisAnalysis.relative_distance(ephemeris_primary, ephemeris_secondary)
+        relative_motion["ric"] = EphemerisAnalysis.relative_ric_components(ephemeris_primary, ephemeris_secondary)
+        return relative_motion
+
+    def plot_relative_distance_vs_time(self, relative_motion: np.ndarray, output_path: Optional[str] = None):
+        import matplotlib.pyplot as plt
+        elapsed_time = relative_motion["elapsed_time"] / self.HOUR
+        relative_distances = relative_motion["distance"] / self.KILOMETER_TO_METER
 
         plt.plot(elapsed_time, relative_distances, label="Relative distance")
         plt.xlabel("Elapsed Time (hours)")
@@ -45,32 +70,21 @@ class PropagationPostProcessing:
         plt.title("Relative Distance vs Time")
         plt.grid(True)
         plt.legend()
-        plt.show()
-
-    def compute_relative_distance(self, state1: SpacecraftState, state2: SpacecraftState):
-        return state1.getPosition().subtract(state2.getPosition()).getNorm()
-
-    def check_time_steps(self, states_primary: List[SpacecraftState], states_secondary: List[SpacecraftState]) -> None:
-        if len(states_primary) != len(states_secondary):
-            raise ValueError(
-                "Primary and secondary object ephemeris size mismatch: {} vs {}.".format(len(states_primary),
-                                                                                         len(states_secondary)))
+        self.show_or_save(plt, output_path)
 
-        for index, (state1, state2) in enumerate(zip(states_primary, states_secondary)):
-            if not self.check_time_step(state1, state2):
-                raise ValueError("Time step mismatch at index {}: {} vs {}.".format(
-                    index, state1.getDate(), state2.getDate()
-                ))
+    def compute_relative_distance(self, ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray):
+        return EphemerisAnalysis.relative_distance(ephemeris_primary, ephemeris_secondary)
 
-    def check_time_step(self, state1: SpacecraftState, state2: SpacecraftState):
-        return abs(state1.getDate().durationFrom(state2.getDate())) < self.DATE_TOLERANCE
+    def check_time_steps(self, ephemeris_primary: np.ndarray, ephemeris_secondary: np.ndarray) -> None:
+        EphemerisAnalysis.check_time_alignment(ephemeris_primary, ephemeris_secondary, self.DATE_TOLERANCE)
 
-    def plot_3d_trajectories_with_moon(self, states_primary, states_secondary):
+    def plot_3d_trajectories_with_moon(self, ephemeris_primary, ephemeris_secondary, output_path: Optional[str] = None):
+        import matplotlib.pyplot as plt
         fig = plt.figure(figsize=(10, 8))
         ax = fig.add_subplot(111, projection='3d')
-        x_primary, y_primary, z_primary = self.extract_positions(states_primary)
+        x_primary, y_primary, z_primary = self.extract_positions(ephemeris_primary)
         ax.plot(x_primary, y_primary, z_primary, label="Primary Trajectory", color='b')
-        x_secondary, y_secondary, z_secondary = self.extract_positions(states_secondary)
+        x_secondary, y_secondary, z_secondary = self.extract_positions(ephemeris_secondary)
         ax.plot(x_secondary, y_secondary, z_secondary, label="Secondary Trajectory", color='r')
         x_moon, y_moon, z_moon = self.create_moon_sphere()
         ax.plot_surface(x_moon, y_moon, z_moon, color='gray', alpha=0.6, rstride=2, cstride=2)
@@ -84,7 +98,7 @@ class PropagationPostProcessing:
         ax.set_xlim([min_limit, min_limit + max_range])
         ax.set_ylim([min_limit, min_limit + max_range])
         ax.set_zlim([min_limit, min_limit + max_range])
-        plt.show()
+        self.show_or_save(plt, output_path)
 
     def create_moon_sphere(self):
         moon_radius = Constants.MOON_EQUATORIAL_RADIUS / self.KILOMETER_TO_METER
@@ -1,12 +1,30 @@
+from collections import Counter
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from java.util import ArrayList
+from org.hipparchus.geometry.euclidean.threed import Vector3D
 from org.hipparchus.ode.nonstiff import DormandPrince853Integrator
+from org.orekit.attitudes import LofOffset
 from org.orekit.bodies import CelestialBodyFactory
 from org.orekit.forces.gravity import HolmesFeatherstoneAttractionModel, ThirdBodyAttraction
 from org.orekit.forces.gravity.potential import GravityFieldFactory
-from org.orekit.orbits import KeplerianOrbit
-from org.orekit.propagation import SpacecraftState, Propagator
+from org.orekit.forces.maneuvers import ImpulseManeuver
+from org.orekit.frames import LOFType
+from org.orekit.orbits import KeplerianOrbit, OrbitType
+from org.orekit.propagation import SpacecraftState, PropagatorsParallelizer
+from org.orekit.propagation.events import DateDetector
 from org.orekit.propagation.numerical import NumericalPropagator
+from org.orekit.time import AbsoluteDate
 
+from src.propagation.DenseOutputStepHandler import DenseOutputStepHandler
 from src.propagation.EphemerisStepHandler import EphemerisStepHandler
+from src.propagation.FormationStepHandler import FormationStepHandler
+from src.propagation.InstrumentedForceModel import InstrumentedForceModel
+from src.propagation.IntegratorStepRecorder import IntegratorStepRecorder
+from src.propagation.PolynomialEphemeris import PolynomialEphemeris
+from src.propagation.PropagationInstrumentation import PropagationInstrumentation
 
 
 class PropagatorFactory:
@@ -20,36 +38,170 @@ class PropagatorFactory:
 
     DEFAULT_HANDLER_STEP = 60.
 
-    def __init__(self, is_geopotential_added: bool, is_earth_added: bool, is_sun_added: bool) -> None:
+    DEFAULT_MANEUVER_ISP = 240.
+
+    DEFAULT_DENSE_OUTPUT_DEGREE = 10
+
+    STM_NAME = "stm"
+
+    def __init__(self, is_geopotential_added: bool, is_earth_added: bool, is_sun_added: bool,
+                 geopotential_degree: int = DEFAULT_GEOPOTENTIAL_DEGREE,
+                 geopotential_order: int = DEFAULT_GEOPOTENTIAL_ORDER,
+                 instrumentation: Optional[PropagationInstrumentation] = None) -> None:
         self.is_geopotential_added: bool = is_geopotential_added
         self.is_earth_added: bool = is_earth_added
         self.is_sun_added: bool = is_sun_added
+        self.geopotential_degree: int = geopotential_degree
+        self.geopotential_order: int = geopotential_order
+        self.cache: Dict[tuple, object] = {}
+        self.propagator_pool: List[tuple] = []
+        self.built_counter: Counter = Counter()
+        self.reused_counter: Counter = Counter()
+        self.instrumentation: Optional[PropagationInstrumentation] = instrumentation
+        self.step_recorders: Dict[int, IntegratorStepRecorder] = {}
 
     def create_propagator(self, initial_orbit: KeplerianOrbit):
-        numerical_propagator = NumericalPropagator(self.create_integrator())
+        return self.build_propagator(initial_orbit)[0]
+
+    def build_propagator(self, initial_orbit: KeplerianOrbit) -> tuple:
+        integrator = self.create_integrator()
+        numerical_propagator = NumericalPropagator(integrator)
         numerical_propagator.setInitialState(SpacecraftState(initial_orbit))
+        self.built_counter["propagator"] += 1
+
+        self.is_geopotential_added and self.add_force_model(numerical_propagator, "geopotential",
+                                                            self.create_lunar_geopotential(self.geopotential_degree,
+                                                                                           self.geopotential_order))
+        self.is_earth_added and self.add_force_model(numerical_propagator, "earth_third_body",
+                                                     self.create_earth_third_body_attraction())
+        self.is_sun_added and self.add_force_model(numerical_propagator, "sun_third_body",
+                                                   self.create_sun_third_body_attraction())
+        step_recorder = None
+        if self.instrumentation is not None:
+            step_recorder = IntegratorStepRecorder(integrator, self.instrumentation)
+            numerical_propagator.getMultiplexer().add(step_recorder)
+        return numerical_propagator, step_recorder
 
-        self.is_geopotential_added and numerical_propagator.addForceModel(self.create_lunar_geopotential())
-        self.is_earth_added and numerical_propagator.addForceModel(self.create_earth_third_body_attraction())
-        self.is_sun_added and numerical_propagator.addForceModel(self.create_sun_third_body_attraction())
+    def add_force_model(self, propagator: NumericalPropagator, name: str, force_model) -> None:
+        if self.instrumentation is not None:
+            force_model = InstrumentedForceModel(name, force_model, self.instrumentation)
+        propagator.addForceModel(force_model)
+
+    def span(self, name: str):
+        return nullcontext() if self.instrumentation is None else self.instrumentation.span(name)
+
+    def acquire_propagator(self, initial_orbit: KeplerianOrbit):
+        if not self.propagator_pool:
+            numerical_propagator, step_recorder = self.build_propagator(initial_orbit)
+        else:
+            numerical_propagator, step_recorder = self.propagator_pool.pop()
+            numerical_propagator.resetInitialState(SpacecraftState(initial_orbit))
+            self.reused_counter["propagator"] += 1
+            step_recorder is not None and numerical_propagator.getMultiplexer().add(step_recorder)
+        # Only propagators handed out by the pool are tracked, and only until they are released
+        if step_recorder is not None:
+            self.step_recorders[id(numerical_propagator)] = step_recorder
         return numerical_propagator
 
+    def release_propagator(self, propagator: NumericalPropagator) -> None:
+        propagator.clearStepHandlers()
+        propagator.clearEventsDetectors()
+        self.propagator_pool.append((propagator, self.step_recorders.pop(id(propagator), None)))
+
+    def get_cached(self, key: tuple, builder: Callable[[], object]):
+        if key in self.cache:
+            self.reused_counter[key[0]] += 1
+        else:
+            self.cache[key] = builder()
+            self.built_counter[key[0]] += 1
+        return self.cache[key]
+
+    def configuration(self) -> Dict[str, object]:
+        return {"is_geopotential_added": self.is_geopotential_added,
+                "is_earth_added": self.is_earth_added,
+                "is_sun_added": self.is_sun_added,
+                "geopotential_degree": self.geopotential_degree,
+                "geopotential_order": self.geopotential_order,
+                "min_step": self.DEFAULT_MIN_STEP,
+                "max_step": self.DEFAULT_MAX_STEP,
+                "absolute_tolerance": self.DEFAULT_ABSOLUTE_TOLERANCE,
+                "relative_tolerance": self.DEFAULT_RELATIVE_TOLERANCE}
+
+    def statistics(self) -> Dict[str, Dict[str, int]]:
+        return {"built": dict(self.built_counter), "reused": dict(self.reused_counter)}
+
     def create_integrator(self, min_step=DEFAULT_MIN_STEP, max_step=DEFAULT_MAX_STEP,
                           abs_tolerance=DEFAULT_ABSOLUTE_TOLERANCE, relative_tolerance=DEFAULT_RELATIVE_TOLERANCE):
         return DormandPrince853Integrator(min_step, max_step, abs_tolerance, relative_tolerance)
 
+    def create_gravity_provider(self, degree=DEFAULT_GEOPOTENTIAL_DEGREE, order=DEFAULT_GEOPOTENTIAL_ORDER):
+        return self.get_cached(("gravity_provider", degree, order),
+                               lambda: GravityFieldFactory.getNormalizedProvider(degree, order))
+
     def create_lunar_geopotential(self, degree=DEFAULT_GEOPOTENTIAL_DEGREE, order=DEFAULT_GEOPOTENTIAL_ORDER):
-        gravity_provider = GravityFieldFactory.getNormalizedProvider(degree, order)
-        return HolmesFeatherstoneAttractionModel(CelestialBodyFactory.getMoon().getInertiallyOrientedFrame(),
-                                                 gravity_provider)
+        return self.get_cached(("geopotential", degree, order), lambda: HolmesFeatherstoneAttractionModel(
+            CelestialBodyFactory.getMoon().getInertiallyOrientedFrame(), self.create_gravity_provider(degree, order)))
 
     def create_sun_third_body_attraction(self):
-        return ThirdBodyAttraction(CelestialBodyFactory.getSun())
+        return self.get_cached(("sun_third_body",), lambda: ThirdBodyAttraction(CelestialBodyFactory.getSun()))
 
     def create_earth_third_body_attraction(self):
-        return ThirdBodyAttraction(CelestialBodyFactory.getEarth())
+        return self.get_cached(("earth_third_body",), lambda: ThirdBodyAttraction(CelestialBodyFactory.getEarth()))
+
+    def add_fixed_step_handler(self, propagator: NumericalPropagator, reference_epoch: AbsoluteDate = None,
+                               record_mass: bool = False, record_elements: bool = False, keep_states: bool = False,
+                               step: float = DEFAULT_HANDLER_STEP):
+        handler = EphemerisStepHandler(reference_epoch, record_mass, record_elements, keep_states,
+                                       instrumentation=self.instrumentation)
+        propagator.getMultiplexer().add(step, handler)
+        return handler
+
+    def create_stm_propagator(self, initial_orbit: KeplerianOrbit):
+        numerical_propagator = self.create_propagator(initial_orbit)
+        numerical_propagator.setOrbitType(OrbitType.CARTESIAN)
+        harvester = numerical_propagator.setupMatricesComputation(self.STM_NAME, None, None)
+        return numerical_propagator, harvester
 
-    def add_fixed_step_handler(self, propagator: NumericalPropagator):
-        handler = EphemerisStepHandler()
-        Propagator.cast_(propagator).setStepHandler(self.DEFAULT_HANDLER_STEP, handler)
+    def add_dense_output_handler(self, propagator: NumericalPropagator, reference_epoch: AbsoluteDate = None,
+                                 degree: int = DEFAULT_DENSE_OUTPUT_DEGREE):
+        handler = DenseOutputStepHandler(reference_epoch, degree)
+        propagator.getMultiplexer().add(handler)
         return handler
+
+    def propagate_dense(self, initial_orbit: KeplerianOrbit, start: AbsoluteDate, end: AbsoluteDate,
+                        degree: int = DEFAULT_DENSE_OUTPUT_DEGREE) -> PolynomialEphemeris:
+        propagator = self.acquire_propagator(initial_orbit)
+        try:
+            handler = self.add_dense_output_handler(propagator, start, degree)
+            with self.span("propagate_dense"):
+                propagator.propagate(start, end)
+        finally:
+            self.release_propagator(propagator)
+        return handler.ephemeris
+
+    def propagate_formation(self, initial_orbits: List[KeplerianOrbit], start: AbsoluteDate, end: AbsoluteDate,
+                            step: float = DEFAULT_HANDLER_STEP, record_mass: bool = False,
+                            record_elements: bool = False) -> List[np.ndarray]:
+        propagators = [self.acquire_propagator(initial_orbit) for initial_orbit in initial_orbits]
+        try:
+            return self.propagate_in_parallel(propagators, start, end, step, record_mass, record_elements)
+        finally:
+            for propagator in propagators:
+                self.release_propagator(propagator)
+
+    def propagate_in_parallel(self, propagators: List[NumericalPropagator], start: AbsoluteDate, end: AbsoluteDate,
+                              step: float = DEFAULT_HANDLER_STEP, record_mass: bool = False,
+                              record_elements: bool = False) -> List[np.ndarray]:
+        propagator_list = ArrayList()
+        for propagator in propagators:
+            propagator_list.add(propagator)
+
+        handler = FormationStepHandler(len(propagators), start, record_mass, record_elements, self.instrumentation)
+        with self.span("propagate_in_parallel"):
+            PropagatorsParallelizer(propagator_list, step, handler).propagate(start, end)
+        return handler.ephemerides
+
+    def add_impulse_maneuver(self, propagator: NumericalPropagator, date: AbsoluteDate, delta_v_tnw: Vector3D,
+                             isp: float = DEFAULT_MANEUVER_ISP):
+        attitude_override = LofOffset(propagator.getInitialState().getFrame(), LOFType.TNW)
+        propagator.addEventDetector(ImpulseManeuver(DateDetector(date), attitude_override, delta_v_tnw, isp))
@@ -0,0 +1,28 @@
+from org.hipparchus.ode.events import Action
+from org.orekit.propagation import SpacecraftState
+from org.orekit.propagation.events import EventDetector
+from org.orekit.propagation.events.handlers import PythonEventHandler
+from org.orekit.time import AbsoluteDate
+
+
+class SeparationEventHandler(PythonEventHandler):
+    def __init__(self, monitor, increasing_kind: str, decreasing_kind: str, is_primary: bool = False):
+        super(SeparationEventHandler, self).__init__()
+        self.monitor = monitor
+        self.increasing_kind: str = increasing_kind
+        self.decreasing_kind: str = decreasing_kind
+        self.is_primary: bool = is_primary
+
+    def init(self, initial_state: SpacecraftState, target: AbsoluteDate, detector: EventDetector):
+        self.monitor.update_statistics(initial_state, self.is_primary)
+
+    def eventOccurred(self, state: SpacecraftState, detector: EventDetector, increasing: bool):
+        self.monitor.record(state, self.increasing_kind if increasing else self.decreasing_kind, increasing,
+                            self.is_primary)
+        return Action.CONTINUE
+
+    def resetState(self, detector: EventDetector, old_state: SpacecraftState):
+        return old_state
+
+    def finish(self, final_state: SpacecraftState, detector: EventDetector):
+        self.monitor.update_statistics(final_state, self.is_primary)
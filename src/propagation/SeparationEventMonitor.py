@@ -0,0 +1,118 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from org.orekit.orbits import Orbit
+from org.orekit.propagation import BoundedPropagator, SpacecraftState
+from org.orekit.propagation.events import ApsideDetector, ExtremumApproachDetector, RelativeDistanceDetector
+from org.orekit.time import AbsoluteDate
+
+from src.propagation.PropagatorFactory import PropagatorFactory
+from src.propagation.SeparationEventHandler import SeparationEventHandler
+
+
+class SeparationEventMonitor:
+    EVENT_DTYPE = np.dtype([("t", np.float64), ("kind", "U32"), ("increasing", np.bool_), ("distance", np.float64)])
+
+    DEFAULT_DISTANCE_THRESHOLDS = (10000.,)
+    DEFAULT_MAX_CHECK = 60.
+    DEFAULT_CONVERGENCE_THRESHOLD = 1e-6
+    DEFAULT_SEGMENT_DURATION = 86400.
+
+    def __init__(self, propagator_factory: PropagatorFactory,
+                 distance_thresholds: Sequence[float] = DEFAULT_DISTANCE_THRESHOLDS,
+                 max_check: float = DEFAULT_MAX_CHECK,
+                 convergence_threshold: float = DEFAULT_CONVERGENCE_THRESHOLD,
+                 segment_duration: float = DEFAULT_SEGMENT_DURATION) -> None:
+        self.propagator_factory: PropagatorFactory = propagator_factory
+        self.distance_thresholds: Sequence[float] = distance_thresholds
+        self.max_check: float = max_check
+        self.convergence_threshold: float = convergence_threshold
+        self.segment_duration: float = segment_duration
+        self.reference_epoch: Optional[AbsoluteDate] = None
+        self.primary_ephemeris: Optional[BoundedPropagator] = None
+        self.recorded_events: List[tuple] = []
+        self.last_event_times: Dict[str, float] = {}
+        self.minimum_distance: float = np.inf
+        self.maximum_distance: float = -np.inf
+
+    @property
+    def events(self) -> np.ndarray:
+        return np.sort(np.array(self.recorded_events, dtype=self.EVENT_DTYPE), order="t")
+
+    def monitor(self, initial_orbit_primary: Orbit, initial_orbit_secondary: Orbit, start: AbsoluteDate,
+                end: AbsoluteDate) -> np.ndarray:
+        self.reference_epoch = start
+        self.recorded_events = []
+        self.last_event_times = {}
+        self.minimum_distance, self.maximum_distance = np.inf, -np.inf
+
+        # The primary dense output is the only trajectory kept, one segment at a time, so memory is bounded by the
+        # segment duration rather than the arc length: the secondary detectors evaluate against it on demand
+        primary_propagator = self.propagator_factory.acquire_propagator(initial_orbit_primary)
+        try:
+            secondary_propagator = self.propagator_factory.acquire_propagator(initial_orbit_secondary)
+            try:
+                generator = primary_propagator.getEphemerisGenerator()
+                segment_start = start
+                while segment_start.compareTo(end) < 0:
+                    segment_end = segment_start.shiftedBy(min(self.segment_duration, end.durationFrom(segment_start)))
+                    self.propagate_primary_segment(primary_propagator, generator, initial_orbit_primary,
+                                                   segment_start, segment_end)
+                    self.propagate_secondary_segment(secondary_propagator, initial_orbit_secondary, segment_end)
+                    segment_start = segment_end
+            finally:
+                self.propagator_factory.release_propagator(secondary_propagator)
+        finally:
+            self.primary_ephemeris = None
+            self.propagator_factory.release_propagator(primary_propagator)
+        return self.events
+
+    def propagate_primary_segment(self, primary_propagator, generator, initial_orbit_primary: Orbit,
+                                  segment_start: AbsoluteDate, segment_end: AbsoluteDate) -> None:
+        # The single generator restarts its dense output at each propagation, so it only holds the current segment
+        primary_propagator.clearEventsDetectors()
+        self.add_detector(primary_propagator, ApsideDetector(initial_orbit_primary),
+                          "primary_periapsis", "primary_apoapsis", True)
+        final_state = primary_propagator.propagate(segment_start, segment_end)
+        self.primary_ephemeris = generator.getGeneratedEphemeris()
+        primary_propagator.resetInitialState(final_state)
+
+    def propagate_secondary_segment(self, secondary_propagator, initial_orbit_secondary: Orbit,
+                                    segment_end: AbsoluteDate) -> None:
+        secondary_propagator.clearEventsDetectors()
+        self.add_detector(secondary_propagator, ApsideDetector(initial_orbit_secondary),
+                          "secondary_periapsis", "secondary_apoapsis")
+        self.add_detector(secondary_propagator, ExtremumApproachDetector(self.primary_ephemeris),
+                          "closest_approach", "farthest_approach")
+        for distance_threshold in self.distance_thresholds:
+            self.add_detector(secondary_propagator,
+                              RelativeDistanceDetector(self.primary_ephemeris, float(distance_threshold)),
+                              "threshold_{:g}_outbound".format(distance_threshold),
+                              "threshold_{:g}_inbound".format(distance_threshold))
+        secondary_propagator.propagate(segment_end)
+
+    def add_detector(self, propagator, detector, increasing_kind: str, decreasing_kind: str,
+                     is_primary: bool = False) -> None:
+        handler = SeparationEventHandler(self, increasing_kind, decreasing_kind, is_primary)
+        propagator.addEventDetector(detector.withMaxCheck(self.max_check)
+                                    .withThreshold(self.convergence_threshold)
+                                    .withHandler(handler))
+
+    def record(self, state: SpacecraftState, kind: str, increasing: bool, is_primary: bool = False) -> None:
+        # Detectors are re-created at each segment boundary, so an event located on a boundary can be found by both
+        # segments, each within the convergence threshold of the actual event
+        t = state.getDate().durationFrom(self.reference_epoch)
+        if abs(t - self.last_event_times.get(kind, -np.inf)) <= 2 * self.convergence_threshold:
+            return
+        self.last_event_times[kind] = t
+        distance = self.update_statistics(state, is_primary)
+        self.recorded_events.append((t, kind, increasing, distance))
+
+    def update_statistics(self, state: SpacecraftState, is_primary: bool = False) -> float:
+        if is_primary:
+            return np.nan
+        primary_position = self.primary_ephemeris.getPVCoordinates(state.getDate(), state.getFrame()).getPosition()
+        distance = state.getPosition().subtract(primary_position).getNorm()
+        self.minimum_distance = min(self.minimum_distance, distance)
+        self.maximum_distance = max(self.maximum_distance, distance)
+        return distance
@@ -0,0 +1,121 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+from org.orekit.orbits import Orbit
+from org.orekit.propagation import SpacecraftState
+from org.orekit.time import AbsoluteDate
+
+from src.orbits import OrbitUtils
+from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory, tnw_frame
+from src.propagation.PropagatorFactory import PropagatorFactory
+
+
+def vector_to_array(vector) -> np.ndarray:
+    return np.array([vector.getX(), vector.getY(), vector.getZ()])
+
+
+class TargetingResult:
+
+    def __init__(self, target_separation: float, delta_v_tnw: np.ndarray, achieved_separation: float,
+                 iterations: int, converged: bool) -> None:
+        self.target_separation: float = target_separation
+        self.delta_v_tnw: np.ndarray = delta_v_tnw
+        self.achieved_separation: float = achieved_separation
+        self.iterations: int = iterations
+        self.converged: bool = converged
+
+
+class SeparationTargetingSolver:
+    DEFAULT_TOLERANCE = 1.
+    DEFAULT_MAX_ITERATIONS = 8
+    SINGULARITY_THRESHOLD = 1e-9
+
+    def __init__(self, propagator_factory: PropagatorFactory, orbit_factory: KeplerianOrbitFactory,
+                 is_tangential: bool = True, tolerance: float = DEFAULT_TOLERANCE,
+                 max_iterations: int = DEFAULT_MAX_ITERATIONS) -> None:
+        self.propagator_factory: PropagatorFactory = propagator_factory
+        self.orbit_factory: KeplerianOrbitFactory = orbit_factory
+        self.is_tangential: bool = is_tangential
+        self.tolerance: float = tolerance
+        self.max_iterations: int = max_iterations
+        self.propagator = None
+        self.harvester = None
+
+    def solve(self, initial_orbit: Orbit, target_epoch: AbsoluteDate, target_separation: float,
+              initial_guess: Optional[np.ndarray] = None,
+              primary_final_position: Optional[np.ndarray] = None) -> TargetingResult:
+        if primary_final_position is None:
+            primary_final_position = self.propagate_primary(initial_orbit, target_epoch)
+        delta_v_tnw = self.linear_guess(initial_orbit, target_separation) if initial_guess is None else \
+            np.array(initial_guess, dtype=float)
+        pv = initial_orbit.getPVCoordinates(self.orbit_factory.frame)
+        tnw = tnw_frame(vector_to_array(pv.getPosition()), vector_to_array(pv.getVelocity()))
+
+        separation = np.nan
+        for iteration in range(1, self.max_iterations + 1):
+            relative_position, position_sensitivity = self.propagate_secondary(initial_orbit, target_epoch,
+                                                                               delta_v_tnw, primary_final_position)
+            separation = float(np.linalg.norm(relative_position))
+            if abs(separation - target_separation) < self.tolerance:
+                return TargetingResult(target_separation, delta_v_tnw, separation, iteration, True)
+
+            # Newton step on the separation using the state transition matrix: d(separation)/d(delta-V in TNW). Its
+            # direction is undefined when both spacecraft coincide, and the step diverges without any sensitivity
+            if separation < self.SINGULARITY_THRESHOLD:
+                return TargetingResult(target_separation, delta_v_tnw, separation, iteration, False)
+            jacobian = relative_position / separation @ position_sensitivity @ tnw.T
+            sensitivity = abs(jacobian[0]) if self.is_tangential else np.linalg.norm(jacobian)
+            if sensitivity < self.SINGULARITY_THRESHOLD:
+                return TargetingResult(target_separation, delta_v_tnw, separation, iteration, False)
+            if self.is_tangential:
+                delta_v_tnw = delta_v_tnw + np.array([(target_separation - separation) / jacobian[0], 0., 0.])
+            else:
+                delta_v_tnw = delta_v_tnw + jacobian * (target_separation - separation) / (jacobian @ jacobian)
+        return TargetingResult(target_separation, delta_v_tnw, separation, self.max_iterations, False)
+
+    def solve_batch(self, initial_orbit: Orbit, target_epoch: AbsoluteDate,
+                    target_separations: Sequence[float]) -> List[TargetingResult]:
+        primary_final_position = self.propagate_primary(initial_orbit, target_epoch)
+        results: List[Optional[TargetingResult]] = [None] * len(target_separations)
+        previous_result: Optional[TargetingResult] = None
+        for index in np.argsort(target_separations):
+            target_separation = float(target_separations[index])
+            initial_guess = None if previous_result is None or previous_result.target_separation == 0. else \
+                previous_result.delta_v_tnw * target_separation / previous_result.target_separation
+            previous_result = self.solve(initial_orbit, target_epoch, target_separation, initial_guess,
+                                         primary_final_position)
+            results[index] = previous_result
+        return results
+
+    def linear_guess(self, initial_orbit: Orbit, target_separation: float) -> np.ndarray:
+        mu = initial_orbit.getMu()
+        pv = initial_orbit.getPVCoordinates()
+        radius = pv.getPosition().getNorm()
+        velocity = pv.getVelocity().getNorm()
+        semi_major_axis = initial_orbit.getA()
+        target_period = OrbitUtils.keplerian_period_equation(mu, semi_major_axis) + target_separation / velocity
+        target_semi_major_axis = OrbitUtils.semi_major_axis_from_period(mu, target_period)
+        return np.array([float(OrbitUtils.live_forces_equation(mu, radius, target_semi_major_axis) - velocity),
+                         0., 0.])
+
+    def propagate(self, orbit: Orbit, target_epoch: AbsoluteDate) -> SpacecraftState:
+        # Both spacecraft go through the same Cartesian propagator so that the separation residual compares
+        # trajectories integrated with identical settings; resetting the state also restarts the STM from identity
+        if self.propagator is None:
+            self.propagator, self.harvester = self.propagator_factory.create_stm_propagator(orbit)
+        self.propagator.resetInitialState(SpacecraftState(orbit))
+        return self.propagator.propagate(target_epoch)
+
+    def propagate_primary(self, initial_orbit: Orbit, target_epoch: AbsoluteDate) -> np.ndarray:
+        final_state = self.propagate(initial_orbit, target_epoch)
+        return vector_to_array(final_state.getPVCoordinates(self.orbit_factory.frame).getPosition())
+
+    def propagate_secondary(self, initial_orbit: Orbit, target_epoch: AbsoluteDate, delta_v_tnw: np.ndarray,
+                            primary_final_position: np.ndarray):
+        final_state = self.propagate(self.orbit_factory.create_maneuvered_orbit(initial_orbit, delta_v_tnw),
+                                     target_epoch)
+        state_transition_matrix = self.harvester.getStateTransitionMatrix(final_state)
+        position_sensitivity = np.array([[state_transition_matrix.getEntry(row, column) for column in range(3, 6)]
+                                         for row in range(3)])
+        final_position = vector_to_array(final_state.getPVCoordinates(self.orbit_factory.frame).getPosition())
+        return final_position - primary_final_position, position_sensitivity
@@ -0,0 +1,37 @@
+import pytest
+
+from src.benchmark.BenchmarkBaseline import BenchmarkBaseline
+
+
+def create_baseline():
+    return BenchmarkBaseline({"propagation_central_body": {"steps": 100, "wall_time": 1., "steps_per_second": 100.},
+                              "post_processing_1000": {"states": 1000, "wall_time": 0.01}},
+                             {"python": "3.11.0"})
+
+
+def test_slower_and_lower_throughput_metrics_are_flagged():
+    regressions = create_baseline().compare(
+        {"propagation_central_body": {"steps": 200, "wall_time": 1.5, "steps_per_second": 60.},
+         "post_processing_1000": {"states": 1000, "wall_time": 0.011}}, tolerance=0.15)
+
+    assert [(regression["benchmark"], regression["metric"]) for regression in regressions] == [
+        ("propagation_central_body", "steps_per_second"), ("propagation_central_body", "wall_time")]
+    assert regressions[1]["change"] == pytest.approx(0.5)
+
+
+def test_improvements_and_unknown_benchmarks_are_not_flagged():
+    regressions = create_baseline().compare(
+        {"propagation_central_body": {"wall_time": 0.5, "steps_per_second": 200.},
+         "propagation_geopotential_3x3": {"wall_time": 10.}})
+
+    assert regressions == []
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    create_baseline().save(path)
+
+    baseline = BenchmarkBaseline.load(path)
+
+    assert baseline.results == create_baseline().results
+    assert baseline.environment_differences({"python": "3.12.0"}) == {"python": ("3.11.0", "3.12.0")}
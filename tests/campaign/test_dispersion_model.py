@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.campaign.CampaignResult import CampaignResult
+from src.campaign.DispersionModel import DispersionModel
+from src.campaign.SeparationScenario import SeparationScenario
+
+
+def test_sampling_is_reproducible_from_seed():
+    dispersion_model = DispersionModel(0.01, delta_v_relative_sigma=0.05, pointing_sigma=0.01, burn_epoch_sigma=1.)
+
+    samples = dispersion_model.sample(1000, seed=42)
+
+    assert np.array_equal(samples, dispersion_model.sample(1000, seed=42))
+    assert samples["run_id"] == pytest.approx(np.arange(1000))
+    assert samples["delta_v"].mean() == pytest.approx(0.01, 1e-2)
+    assert samples["semi_major_axis_offset"] == pytest.approx(np.zeros(1000))
+
+
+def test_delta_v_tnw_keeps_magnitude():
+    samples = DispersionModel(0.01, pointing_sigma=0.1).sample(100, seed=1)
+
+    delta_v_tnw = DispersionModel.delta_v_tnw(samples)
+
+    assert np.linalg.norm(delta_v_tnw, axis=-1) == pytest.approx(samples["delta_v"])
+    assert np.all(delta_v_tnw[:, 0] > 0.)
+
+
+def test_campaign_result_summary_ignores_unreached_threshold():
+    result = CampaignResult()
+    metrics = np.zeros(2, dtype=CampaignResult.METRICS_DTYPE)
+    metrics["run_id"] = [0, 1]
+    metrics["final_separation"] = [10000., 12000.]
+    metrics["time_to_threshold"] = [50000., np.nan]
+    result.add(metrics[:1])
+    result.add(metrics[1:])
+
+    summary = result.summary()
+
+    assert len(result) == 2
+    assert summary["final_separation"]["mean"] == pytest.approx(11000.)
+    assert summary["time_to_threshold"]["count"] == 1
+
+
+def test_scenario_rejects_burns_before_the_propagation_start():
+    scenario = SeparationScenario("2025-01-23T00:00:00.000", 6787400., 0.73, 1.57, 0., 0., 0., 3600., burn_margin=60.)
+    samples = DispersionModel(0.01).sample(3, seed=0)
+    scenario.check_burn_epochs(samples)
+    samples["burn_epoch_offset"][1] = -61.
+
+    with pytest.raises(ValueError, match=r"Runs \[1\]"):
+        scenario.check_burn_epochs(samples)
@@ -0,0 +1,100 @@
+import orekit
+orekit.initVM()
+import numpy as np
+import pytest
+
+from src.campaign.CampaignResult import CampaignResult
+from src.campaign.DispersionModel import DispersionModel
+from src.campaign.MonteCarloCampaign import MonteCarloCampaign
+from src.campaign.SeparationRunner import SeparationRunner
+from src.campaign.SeparationScenario import SeparationScenario
+
+
+def create_scenario():
+    return SeparationScenario("2025-01-23T00:00:00.000", 6787400., 0.73, 1.57, 0., 0., 0., 3600.,
+                              is_geopotential_added=False, is_earth_added=False, is_sun_added=False)
+
+
+def test_campaign_resumes_from_checkpoint(tmp_path):
+    checkpoint_path = str(tmp_path / "campaign.npz")
+    dispersion_model = DispersionModel(0.01)
+    campaign = MonteCarloCampaign(create_scenario(), dispersion_model, 4, seed=0, checkpoint_path=checkpoint_path)
+    metrics = np.zeros(4, dtype=CampaignResult.METRICS_DTYPE)
+    metrics["run_id"] = np.arange(4)
+    metrics["final_separation"] = 10000.
+    campaign.save_checkpoint(CampaignResult(metrics), dispersion_model.sample(4, 0))
+
+    result = campaign.run()
+
+    assert len(result) == 4
+    assert result.summary()["final_separation"]["mean"] == pytest.approx(10000.)
+
+
+def test_checkpoint_of_another_configuration_is_rejected(tmp_path):
+    checkpoint_path = str(tmp_path / "campaign.npz")
+    dispersion_model = DispersionModel(0.01, delta_v_relative_sigma=0.1)
+    MonteCarloCampaign(create_scenario(), dispersion_model, 4, seed=0, checkpoint_path=checkpoint_path
+                       ).save_checkpoint(CampaignResult(), dispersion_model.sample(4, 0))
+
+    with pytest.raises(ValueError):
+        MonteCarloCampaign(create_scenario(), dispersion_model, 4, seed=1, checkpoint_path=checkpoint_path).run()
+    with pytest.raises(ValueError):
+        MonteCarloCampaign(create_scenario(), DispersionModel(0.02), 4, seed=0, checkpoint_path=checkpoint_path).run()
+
+
+def test_unseeded_campaign_resumes_with_checkpointed_samples(tmp_path):
+    checkpoint_path = str(tmp_path / "campaign.npz")
+    dispersion_model = DispersionModel(0.01, delta_v_relative_sigma=0.1)
+    samples = dispersion_model.sample(4)
+    MonteCarloCampaign(create_scenario(), dispersion_model, 4, checkpoint_path=checkpoint_path
+                       ).save_checkpoint(CampaignResult(), samples)
+
+    checkpointed_samples, metrics = MonteCarloCampaign(create_scenario(), dispersion_model, 4,
+                                                       checkpoint_path=checkpoint_path).load_checkpoint()
+
+    assert np.array_equal(checkpointed_samples, samples)
+    assert len(metrics) == 0
+
+
+def test_burn_before_propagation_start_is_rejected():
+    campaign = MonteCarloCampaign(create_scenario(), DispersionModel(0.01, burn_epoch_sigma=1e4), 16, seed=0)
+
+    with pytest.raises(ValueError):
+        campaign.run()
+
+
+def test_propagators_are_released_when_the_maneuver_cannot_be_built(monkeypatch):
+    runner = SeparationRunner(create_scenario())
+    samples = DispersionModel(0.01).sample(1, 0)
+
+    def fail(*args):
+        raise RuntimeError("invalid maneuver")
+
+    monkeypatch.setattr(runner.propagator_factory, "add_impulse_maneuver", fail)
+    with pytest.raises(RuntimeError):
+        runner.run(samples[0], DispersionModel.delta_v_tnw(samples)[0])
+
+    assert len(runner.propagator_factory.propagator_pool) == 2
+
+
+def test_interrupted_campaign_resumes_without_losing_or_duplicating_runs(tmp_path):
+    checkpoint_path = str(tmp_path / "campaign.npz")
+    dispersion_model = DispersionModel(0.01, delta_v_relative_sigma=0.1, pointing_sigma=0.01)
+    reference = MonteCarloCampaign(create_scenario(), dispersion_model, 6, seed=3, worker_number=2,
+                                   chunk_size=1).run()
+    reference_metrics = np.sort(reference.metrics, order="run_id")
+
+    # Interruption after three completed runs, as left behind by a periodic checkpoint
+    interrupted = MonteCarloCampaign(create_scenario(), dispersion_model, 6, seed=3, worker_number=2, chunk_size=1,
+                                     checkpoint_path=checkpoint_path)
+    interrupted.save_checkpoint(CampaignResult(reference_metrics[[0, 2, 5]]), dispersion_model.sample(6, 3))
+    resumed = MonteCarloCampaign(create_scenario(), dispersion_model, 6, seed=3, worker_number=2, chunk_size=1,
+                                 checkpoint_path=checkpoint_path).run()
+    resumed_metrics = np.sort(resumed.metrics, order="run_id")
+
+    assert reference_metrics["run_id"] == pytest.approx(np.arange(6))
+    assert np.all(np.isfinite(reference_metrics["final_separation"]))
+    assert resumed_metrics["run_id"] == pytest.approx(np.arange(6))
+    assert resumed_metrics["final_separation"] == pytest.approx(reference_metrics["final_separation"], 1e-9)
+    with np.load(checkpoint_path) as checkpoint:
+        assert np.sort(checkpoint["metrics"]["run_id"]) == pytest.approx(np.arange(6))
@@ -1,4 +1,5 @@
 import orekit
+import numpy as np
 import pytest
 
 from src.orbits import OrbitUtils
@@ -17,4 +18,14 @@ def test_keplerian_period():
     assert OrbitUtils.keplerian_period_equation(EARTH_MU,iss_semi_major_axis) == pytest.approx(5544.855, 1e-3)
 
 def test_rocket_equation():
-    assert OrbitUtils.rocket_equation_duration_from_delta_v(1.,1.,1.,1.) == pytest.approx(1.,1.)
\ No newline at end of file
+    assert OrbitUtils.rocket_equation_duration_from_delta_v(1.,1.,1.,1.) == pytest.approx(1.,1.)
+
+def test_equations_broadcast_over_arrays():
+    semi_major_axes = np.array([EARTH_AVERAGE_RADIUS + ISS_ALTITUDE, 2 * (EARTH_AVERAGE_RADIUS + ISS_ALTITUDE)])
+    periods = OrbitUtils.keplerian_period_equation(EARTH_MU, semi_major_axes)
+    assert periods.shape == (2,)
+    assert OrbitUtils.semi_major_axis_from_period(EARTH_MU, periods) == pytest.approx(semi_major_axes, 1e-12)
+    assert OrbitUtils.live_forces_equation(EARTH_MU, semi_major_axes, semi_major_axes)[0] == pytest.approx(
+        7672.5982, 1e-3)
+    assert OrbitUtils.orbit_radius_equation(10., 0.5, np.array([0., np.pi])) == pytest.approx([5., 15.])
+    assert OrbitUtils.rocket_equation_duration_from_delta_v(1., 1., 1., [1., 1.]) == pytest.approx([1., 1.], 1.)
@@ -0,0 +1,32 @@
+import orekit
+import numpy as np
+import pytest
+
+from src.orbits.SeparationTradeStudy import SeparationTradeStudy
+
+MOON_MU = 4.9028e12 # m^3/s^2
+
+
+def test_trade_study_matches_main_script_design_point():
+    result = SeparationTradeStudy(MOON_MU).evaluate(100. * 1000, 10000. * 1000, 10. * 1000, 0., 1000., 240., 20.)
+
+    assert result.target_semi_major_axis.item() == pytest.approx(6787819.8, 1e-6)
+    assert result.delta_v.item() == pytest.approx(0.0103983, 1e-4)
+    assert result.burn_duration.item() == pytest.approx(0.5199088, 1e-4)
+
+
+def test_trade_study_evaluates_full_grid():
+    study = SeparationTradeStudy(MOON_MU)
+    result = study.evaluate(np.linspace(50., 200., 4) * 1000, np.linspace(1000., 10000., 5) * 1000,
+                            [5000., 10000.], [0., np.pi], [800., 1000.], [220., 240.], [10., 20., 40.])
+
+    assert result.shape == (4, 5, 2, 2, 2, 2, 3)
+    assert result.burn_duration.shape == result.shape
+    assert np.all(result.delta_v > 0.)
+    assert set(result.design_point(0).keys()) == set(SeparationTradeStudy.AXES)
+
+
+def test_trade_study_masks_inconsistent_apsides():
+    result = SeparationTradeStudy(MOON_MU).evaluate(500. * 1000, 100. * 1000, 10000., 0., 1000., 240., 20.)
+
+    assert np.isnan(result.delta_v.item())
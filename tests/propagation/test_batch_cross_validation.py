@@ -0,0 +1,54 @@
+import orekit
+orekit.initVM()
+import numpy as np
+from org.orekit.bodies import CelestialBodyFactory
+from org.orekit.forces.gravity import J2OnlyPerturbation
+from org.orekit.orbits import PositionAngleType
+from org.orekit.time import AbsoluteDate, TimeScalesFactory
+
+from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory
+from src.propagation.BatchKeplerianPropagator import BatchKeplerianPropagator
+from src.propagation.ColumnarEphemeris import positions
+from src.propagation.PropagatorFactory import PropagatorFactory
+
+ELEMENTS = (2200. * 1000, 0.05, np.radians(50.), 0.4, 1., 0.5)
+DURATION = 20000.
+
+
+def propagate_with_orekit(is_j2_added: bool) -> np.ndarray:
+    moon = CelestialBodyFactory.getMoon()
+    frame = moon.getInertiallyOrientedFrame()
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, frame, moon.getGM())
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+
+    propagator_factory = PropagatorFactory(False, False, False)
+    propagator = propagator_factory.create_propagator(
+        lunar_orbit_factory.create_keplerian_orbit(initial_epoch, *ELEMENTS))
+    is_j2_added and propagator.addForceModel(J2OnlyPerturbation(moon.getGM(),
+                                                                BatchKeplerianPropagator.MOON_REFERENCE_RADIUS,
+                                                                BatchKeplerianPropagator.MOON_J2, frame))
+    handler = propagator_factory.add_fixed_step_handler(propagator, initial_epoch)
+    propagator.propagate(initial_epoch, initial_epoch.shiftedBy(DURATION))
+    return handler.ephemeris
+
+
+def propagate_in_batch(is_j2_added: bool, is_short_period_added: bool) -> np.ndarray:
+    propagator = BatchKeplerianPropagator(PositionAngleType.TRUE, CelestialBodyFactory.getMoon().getGM(),
+                                          BatchKeplerianPropagator.MOON_J2 if is_j2_added else 0.,
+                                          is_short_period_added=is_short_period_added)
+    return propagator.propagate(*ELEMENTS, np.arange(0., DURATION + 1., PropagatorFactory.DEFAULT_HANDLER_STEP))[0]
+
+
+def position_error(numerical_ephemeris: np.ndarray, batch_ephemeris: np.ndarray) -> float:
+    return float(np.max(np.linalg.norm(positions(numerical_ephemeris) - positions(batch_ephemeris), axis=-1)))
+
+
+def test_keplerian_batch_matches_numerical_two_body_propagation():
+    assert position_error(propagate_with_orekit(False), propagate_in_batch(False, False)) < 1.
+
+
+def test_j2_batch_matches_numerical_j2_propagation():
+    numerical_ephemeris = propagate_with_orekit(True)
+
+    assert position_error(numerical_ephemeris, propagate_in_batch(True, False)) < 2000.
+    assert position_error(numerical_ephemeris, propagate_in_batch(True, True)) < 20.
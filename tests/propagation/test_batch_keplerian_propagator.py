@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.propagation.BatchKeplerianPropagator import BatchKeplerianPropagator
+from src.propagation.ColumnarEphemeris import positions, velocities
+
+MOON_MU = 4.9028e12 # m^3/s^2
+
+
+def test_keplerian_batch_is_periodic_and_conserves_energy():
+    semi_major_axes = np.array([2000., 4000., 6787.4]) * 1000
+    periods = 2 * np.pi * np.sqrt(semi_major_axes ** 3 / MOON_MU)
+    propagator = BatchKeplerianPropagator("TRUE", MOON_MU)
+
+    ephemeris = propagator.propagate(semi_major_axes, [0.01, 0.3, 0.73], np.pi / 2, 0.3, 0.2, 0.1,
+                                     np.linspace(0., 50000., 101))
+    assert ephemeris.shape == (3, 101)
+
+    position, velocity = positions(ephemeris), velocities(ephemeris)
+    energy = np.sum(velocity ** 2, axis=-1) / 2 - MOON_MU / np.linalg.norm(position, axis=-1)
+    assert energy == pytest.approx(np.broadcast_to(-MOON_MU / (2 * semi_major_axes[:, np.newaxis]), energy.shape),
+                                   1e-10)
+
+    for index, period in enumerate(periods):
+        revolution = propagator.propagate(semi_major_axes[index], [0.01, 0.3, 0.73][index], np.pi / 2, 0.3, 0.2,
+                                          0.1, [0., period])[0]
+        assert positions(revolution)[1] == pytest.approx(positions(revolution)[0], abs=1e-3)
+
+
+def test_anomaly_types_are_consistent():
+    true_ephemeris = BatchKeplerianPropagator("TRUE", MOON_MU).propagate(3000e3, 0.2, 1., 0., 0., 0., [0., 100.])
+    mean_ephemeris = BatchKeplerianPropagator("MEAN", MOON_MU).propagate(3000e3, 0.2, 1., 0., 0., 0., [0., 100.])
+
+    assert positions(true_ephemeris) == pytest.approx(positions(mean_ephemeris), abs=1e-6)
+    with pytest.raises(ValueError):
+        BatchKeplerianPropagator("HYPERBOLIC", MOON_MU)
+
+
+def test_j2_secular_drift_of_node_and_periapsis():
+    propagator = BatchKeplerianPropagator("MEAN", MOON_MU, BatchKeplerianPropagator.MOON_J2)
+
+    ephemeris = propagator.propagate(2000e3, 0.01, np.radians([30., 90.]), 1., 1., 0., [0., 86400.])
+
+    assert ephemeris["raan"][0, 1] < ephemeris["raan"][0, 0]
+    assert ephemeris["raan"][1, 1] == pytest.approx(1., abs=1e-12)
+    assert ephemeris["argument_of_periapsis"][0, 1] > ephemeris["argument_of_periapsis"][0, 0]
+
+
+def test_short_period_terms_round_trip_to_initial_state():
+    propagator = BatchKeplerianPropagator("TRUE", MOON_MU, BatchKeplerianPropagator.MOON_J2,
+                                          is_short_period_added=True)
+
+    ephemeris = propagator.propagate(2200e3, 0.05, np.radians(50.), 0.4, 1., 0.5, [0.])
+    reference = BatchKeplerianPropagator("TRUE", MOON_MU).propagate(2200e3, 0.05, np.radians(50.), 0.4, 1., 0.5,
+                                                                    [0.])
+
+    assert positions(ephemeris) == pytest.approx(positions(reference), abs=1.)
+
+
+@pytest.mark.parametrize("eccentricity", [0., 0.05])
+def test_short_period_terms_are_finite_for_equatorial_orbits(eccentricity):
+    propagator = BatchKeplerianPropagator("TRUE", MOON_MU, BatchKeplerianPropagator.MOON_J2,
+                                          is_short_period_added=True)
+
+    ephemeris = propagator.propagate(2200e3, eccentricity, [0., np.pi], 0.4, 1., 0.5, np.linspace(0., 20000., 11))
+    reference = BatchKeplerianPropagator("TRUE", MOON_MU).propagate(2200e3, eccentricity, [0., np.pi], 0.4, 1., 0.5,
+                                                                    [0.])
+
+    assert np.all(np.isfinite(positions(ephemeris)))
+    assert np.all(np.isfinite(ephemeris["e"]))
+    assert ephemeris["z"] == pytest.approx(np.zeros_like(ephemeris["z"]), abs=1e-6)
+    assert positions(ephemeris)[:, 0] == pytest.approx(positions(reference)[:, 0], abs=1.)
+
+
+def test_short_period_terms_reject_critical_inclination():
+    propagator = BatchKeplerianPropagator("TRUE", MOON_MU, BatchKeplerianPropagator.MOON_J2,
+                                          is_short_period_added=True)
+
+    with pytest.raises(ValueError):
+        propagator.propagate(2200e3, 0.05, [np.radians(50.), np.radians(63.43)], 0.4, 1., 0.5, [0.])
+    assert np.all(np.isfinite(BatchKeplerianPropagator("TRUE", MOON_MU, BatchKeplerianPropagator.MOON_J2).propagate(
+        2200e3, 0.05, np.radians(63.43), 0.4, 1., 0.5, [0., 100.])["x"]))
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from src.propagation.ColumnarEphemeris import ColumnarEphemeris, positions, velocities
+
+
+def test_columnar_ephemeris_grows_and_keeps_rows():
+    columns = ColumnarEphemeris(capacity=2)
+    for index in range(5):
+        columns.append((index, index, 2. * index, 3. * index, -index, -2. * index, -3. * index))
+
+    ephemeris = columns.to_array()
+    assert len(columns) == 5
+    assert columns.capacity >= 5
+    assert ephemeris["t"] == pytest.approx(np.arange(5.))
+    assert positions(ephemeris)[-1] == pytest.approx([4., 8., 12.])
+    assert velocities(ephemeris)[-1] == pytest.approx([-4., -8., -12.])
+
+
+def test_columnar_ephemeris_optional_columns():
+    columns = ColumnarEphemeris(with_mass=True, with_elements=True)
+    assert "mass" in columns.dtype.names
+    assert "true_anomaly" in columns.dtype.names
+    assert "mass" not in ColumnarEphemeris().dtype.names
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from src.propagation.BatchKeplerianPropagator import BatchKeplerianPropagator
+from src.propagation.ColumnarEphemeris import ephemeris_dtype
+from src.propagation.ConjunctionScreener import ConjunctionScreener, grid_overlap_pairs
+
+MOON_MU = 4.9028e12 # m^3/s^2
+
+
+def create_linear_ephemerides(initial_positions, initial_velocities, times):
+    ephemerides = np.empty((len(initial_positions), len(times)), dtype=ephemeris_dtype())
+    ephemerides["t"] = times
+    for axis, name in enumerate("xyz"):
+        ephemerides[name] = initial_positions[:, axis, np.newaxis] + initial_velocities[:, axis, np.newaxis] * times
+        ephemerides["v" + name] = initial_velocities[:, axis, np.newaxis]
+    return ephemerides
+
+
+def test_grid_overlap_pairs_contain_every_overlapping_pair_once():
+    rng = np.random.default_rng(0)
+    lower = rng.uniform(0., 10., (500, 3))
+    upper = lower + rng.uniform(0., 1., (500, 3)) ** 4 * 5.
+    first, second = np.triu_indices(len(lower), 1)
+    overlapping = np.all((lower[first] <= upper[second]) & (lower[second] <= upper[first]), axis=-1)
+
+    pairs = grid_overlap_pairs(lower, upper, 0.5)
+
+    assert set(zip(first[overlapping], second[overlapping])) <= {tuple(pair) for pair in pairs}
+    assert len(np.unique(pairs, axis=0)) == len(pairs)
+    assert np.all(pairs[:, 0] < pairs[:, 1])
+
+
+def test_screening_matches_brute_force_closest_approaches():
+    rng = np.random.default_rng(1)
+    initial_positions, initial_velocities = rng.uniform(-2e4, 2e4, (300, 3)), rng.uniform(-20., 20., (300, 3))
+    times = np.linspace(0., 1000., 200)
+    threshold = 800.
+
+    screener = ConjunctionScreener(threshold)
+    encounters = screener.screen(create_linear_ephemerides(initial_positions, initial_velocities, times))
+
+    first, second = np.triu_indices(len(initial_positions), 1)
+    relative_position = initial_positions[second] - initial_positions[first]
+    relative_velocity = initial_velocities[second] - initial_velocities[first]
+    closest_time = np.clip(-np.sum(relative_position * relative_velocity, axis=-1) /
+                           np.sum(relative_velocity ** 2, axis=-1), times[0], times[-1])
+    closest_distance = np.linalg.norm(relative_position + relative_velocity * closest_time[:, np.newaxis], axis=-1)
+    expected = {(i, j): (t, distance) for i, j, t, distance in
+                zip(first, second, closest_time, closest_distance) if distance < threshold}
+
+    assert len(expected) > 0
+    assert {(encounter["primary"], encounter["secondary"]) for encounter in encounters} == set(expected)
+    for encounter in encounters:
+        t, distance = expected[(encounter["primary"], encounter["secondary"])]
+        assert encounter["t"] == pytest.approx(t, abs=1e-6)
+        assert encounter["distance"] == pytest.approx(distance, abs=1e-6)
+    assert screener.statistics["candidate_pairs"] < len(first)
+
+
+def test_lunar_orbits_are_shell_filtered_and_close_neighbours_flagged():
+    times = np.linspace(0., 20000., 401)
+    ephemerides = BatchKeplerianPropagator("TRUE", MOON_MU).propagate(
+        [3000e3, 3000e3, 3000e3, 8000e3], [0.1, 0.1, 0.1, 0.], 0.5, 0., 0., [0., 1e-3, 0.5, 0.], times)
+
+    screener = ConjunctionScreener(5000.)
+    encounters = screener.screen(ephemerides)
+
+    assert screener.statistics["shell_filtered_spacecraft"] == 1
+    assert set(zip(encounters["primary"], encounters["secondary"])) == {(0, 1)}
+    assert np.all(encounters["distance"] < 5000.)
+
+
+def test_misaligned_ephemerides_are_rejected():
+    ephemerides = create_linear_ephemerides(np.zeros((2, 3)), np.ones((2, 3)), np.linspace(0., 10., 11))
+    ephemerides["t"][1] += 1.
+
+    with pytest.raises(ValueError):
+        ConjunctionScreener(1.).screen(ephemerides)
+
+
+def test_grid_pairs_grow_linearly_with_density_preserving_populations_and_fast_spacecraft():
+    grid_pairs = []
+    for spacecraft_number in (250, 1000):
+        rng = np.random.default_rng(2)
+        box_size = 2e4 * (spacecraft_number / 250) ** (1 / 3)
+        initial_velocities = rng.uniform(-5., 5., (spacecraft_number, 3))
+        initial_velocities[:5] *= 100.
+        screener = ConjunctionScreener(100.)
+        screener.screen(create_linear_ephemerides(rng.uniform(0., box_size, (spacecraft_number, 3)),
+                                                  initial_velocities, np.linspace(0., 600., 61)))
+        grid_pairs.append(screener.statistics["grid_pairs"])
+
+    assert grid_pairs[1] < 6 * grid_pairs[0]
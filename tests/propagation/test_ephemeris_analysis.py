@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from src.propagation import EphemerisAnalysis
+from src.propagation.ColumnarEphemeris import ephemeris_dtype
+
+
+def create_ephemeris(times, position, velocity):
+    ephemeris = np.zeros(len(times), dtype=ephemeris_dtype())
+    ephemeris["t"] = times
+    ephemeris["x"], ephemeris["y"], ephemeris["z"] = np.asarray(position, dtype=float).T
+    ephemeris["vx"], ephemeris["vy"], ephemeris["vz"] = np.asarray(velocity, dtype=float).T
+    return ephemeris
+
+
+def test_relative_distance_and_ric_components():
+    times = np.array([0., 60.])
+    primary = create_ephemeris(times, [[1000., 0., 0.], [0., 1000., 0.]], [[0., 10., 0.], [-10., 0., 0.]])
+    secondary = create_ephemeris(times, [[1003., 4., 0.], [0., 1000., 5.]], [[0., 10., 0.], [-10., 0., 0.]])
+
+    assert EphemerisAnalysis.relative_distance(primary, secondary) == pytest.approx([5., 5.])
+    ric = EphemerisAnalysis.relative_ric_components(primary, secondary)
+    assert ric[0] == pytest.approx([3., 4., 0.])
+    assert ric[1] == pytest.approx([0., 0., 5.])
+
+
+def test_check_time_alignment():
+    primary = create_ephemeris([0., 60.], np.ones((2, 3)), np.ones((2, 3)))
+    shifted = create_ephemeris([0., 61.], np.ones((2, 3)), np.ones((2, 3)))
+
+    EphemerisAnalysis.check_time_alignment(primary, primary, 1e-9)
+    with pytest.raises(ValueError, match="index 1"):
+        EphemerisAnalysis.check_time_alignment(primary, shifted, 1e-9)
+    with pytest.raises(ValueError, match="size mismatch"):
+        EphemerisAnalysis.check_time_alignment(primary, primary[:1], 1e-9)
+
+
+def test_first_crossing_time_interpolates_between_samples():
+    times = np.array([0., 10., 20., 30.])
+    values = np.array([0., 4., 8., 12.])
+
+    assert EphemerisAnalysis.first_crossing_time(times, values, 10.) == pytest.approx(25.)
+    assert EphemerisAnalysis.first_crossing_time(times, values, 0.) == pytest.approx(0.)
+    assert np.isnan(EphemerisAnalysis.first_crossing_time(times, values, 20.))
@@ -0,0 +1,62 @@
+import orekit
+orekit.initVM()
+import os
+
+import numpy as np
+from org.orekit.bodies import CelestialBodyFactory
+from org.orekit.orbits import PositionAngleType
+from org.orekit.time import AbsoluteDate, TimeScalesFactory
+
+from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory
+from src.propagation.ColumnarEphemeris import ephemeris_dtype
+from src.propagation.EphemerisCache import EphemerisCache
+from src.propagation.PropagatorFactory import PropagatorFactory
+
+
+def create_data_file(tmp_path, content=b"orekit-data"):
+    data_path = tmp_path / "orekit-data.zip"
+    data_path.write_bytes(content)
+    return str(data_path)
+
+
+def test_repeated_propagation_is_read_back_from_memory_map(tmp_path):
+    moon = CelestialBodyFactory.getMoon()
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    initial_orbit = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 2000. * 1000, 0.1, 0.5, 0., 0., 0.)
+    propagator_factory = PropagatorFactory(False, False, False)
+    cache = EphemerisCache(str(tmp_path / "cache"), data_path=create_data_file(tmp_path))
+
+    ephemeris = cache.propagate(propagator_factory, initial_orbit, initial_epoch, initial_epoch.shiftedBy(600.))
+    cached_ephemeris = cache.propagate(propagator_factory, initial_orbit, initial_epoch, initial_epoch.shiftedBy(600.))
+
+    assert isinstance(cached_ephemeris, np.memmap)
+    assert np.array_equal(cached_ephemeris, ephemeris)
+    assert propagator_factory.statistics()["built"]["propagator"] == 1
+    assert cache.key(propagator_factory, initial_orbit, initial_epoch, initial_epoch.shiftedBy(600.), 30.) not in \
+           cache.entries()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    ephemeris = np.zeros(100, dtype=ephemeris_dtype())
+    cache = EphemerisCache(str(tmp_path / "cache"), max_bytes=2 * ephemeris.nbytes + 1000,
+                           data_path=create_data_file(tmp_path))
+
+    cache.store("first", ephemeris)
+    cache.store("second", ephemeris)
+    os.utime(cache.ephemeris_path("first"), ns=(0, 0))
+    cache.load("second")
+    cache.store("third", ephemeris)
+
+    assert sorted(cache.entries()) == ["second", "third"]
+
+
+def test_entries_are_invalidated_when_data_changes(tmp_path):
+    data_path = create_data_file(tmp_path)
+    EphemerisCache(str(tmp_path / "cache"), data_path=data_path).store("entry", np.zeros(1, dtype=ephemeris_dtype()))
+
+    create_data_file(tmp_path, b"updated orekit-data")
+    cache = EphemerisCache(str(tmp_path / "cache"), data_path=data_path)
+
+    assert cache.invalidate_stale() == ["entry"]
+    assert cache.entries() == []
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.propagation.BatchKeplerianPropagator import BatchKeplerianPropagator
+from src.propagation.ColumnarEphemeris import positions, velocities
+from src.propagation.PolynomialEphemeris import PolynomialEphemeris, chebyshev_nodes
+
+MOON_MU = 4.9028e12 # m^3/s^2
+ELEMENTS = (6787.4 * 1000, 0.7292925, np.pi / 2, 0., 0., 0.)
+
+
+def create_polynomial_ephemeris(segment_edges):
+    propagator = BatchKeplerianPropagator("TRUE", MOON_MU)
+    starts, ends = segment_edges[:-1], segment_edges[1:]
+    node_times = (starts + ends)[:, np.newaxis] / 2 + (ends - starts)[:, np.newaxis] / 2 * chebyshev_nodes(11)
+    node_ephemeris = propagator.propagate(*ELEMENTS, node_times.ravel())[0].reshape(node_times.shape)
+    node_values = np.stack([node_ephemeris[component] for component in PolynomialEphemeris.COMPONENTS], axis=-1)
+    return PolynomialEphemeris.fit(starts, ends, node_values), propagator
+
+
+def test_vectorized_evaluation_matches_reference_trajectory():
+    segment_edges = np.concatenate((np.linspace(0., 2000., 41), np.linspace(2100., 50000., 60)))
+    polynomial_ephemeris, propagator = create_polynomial_ephemeris(segment_edges)
+    times = np.random.default_rng(0).uniform(0., 50000., 1000)
+
+    ephemeris = polynomial_ephemeris.evaluate(times)
+    reference = propagator.propagate(*ELEMENTS, times)[0]
+
+    assert ephemeris["t"] == pytest.approx(times)
+    assert np.max(np.abs(positions(ephemeris) - positions(reference))) < 1e-2
+    assert np.max(np.abs(velocities(ephemeris) - velocities(reference))) < 1e-5
+    with pytest.raises(ValueError):
+        polynomial_ephemeris.evaluate([50001.])
+
+
+def test_adaptive_resampling_is_denser_near_periapsis():
+    segment_edges = np.concatenate((np.linspace(0., 2000., 41), np.linspace(2100., 50000., 60)))
+    polynomial_ephemeris, _ = create_polynomial_ephemeris(segment_edges)
+
+    times = polynomial_ephemeris.adaptive_times(100. * 1000)
+    steps = np.diff(times)
+
+    assert times[0] == pytest.approx(0.)
+    assert times[-1] == pytest.approx(50000.)
+    assert steps[0] < steps[len(steps) // 2] / 3
+
+
+def test_coefficients_round_trip_through_npz(tmp_path):
+    polynomial_ephemeris, _ = create_polynomial_ephemeris(np.linspace(0., 6000., 7))
+    path = str(tmp_path / "ephemeris.npz")
+
+    polynomial_ephemeris.save(path)
+    loaded_ephemeris = PolynomialEphemeris.load(path)
+
+    assert np.array_equal(loaded_ephemeris.coefficients, polynomial_ephemeris.coefficients)
+    assert loaded_ephemeris.evaluate([1234.5]) == polynomial_ephemeris.evaluate([1234.5])
@@ -6,6 +6,7 @@ from org.orekit.orbits import PositionAngleType
 from org.orekit.time import AbsoluteDate, TimeScalesFactory
 
 from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory
+from src.propagation.PropagationInstrumentation import PropagationInstrumentation
 from src.propagation.PropagatorFactory import PropagatorFactory
 
 
@@ -20,7 +21,143 @@ def test_propagator_creation_and_propagation():
                                                                0., 0., 0., 0.)
 
     propagator = propagator_factory.create_propagator(initial_orbit)
+    handler = propagator_factory.add_fixed_step_handler(propagator, keep_states=True)
     propagator.propagate(initial_epoch, initial_epoch.shiftedBy(duration))
-    handler = propagator_factory.add_fixed_step_handler(propagator)
 
     assert handler.states[-1].getDate().durationFrom(initial_epoch) == pytest.approx(duration, 1e-9)
+    assert handler.ephemeris["t"][-1] == pytest.approx(duration, 1e-9)
+    assert len(handler.ephemeris) == len(handler.states)
+
+
+def test_fixed_step_handler_records_columnar_ephemeris():
+    moon = CelestialBodyFactory.getMoon()
+    propagator_factory = PropagatorFactory(False, False, False)
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    semi_major_axis = 2000. * 1000
+    initial_orbit = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, semi_major_axis, 0.1,
+                                                               0.5, 0., 0., 0.)
+
+    propagator = propagator_factory.create_propagator(initial_orbit)
+    handler = propagator_factory.add_fixed_step_handler(propagator, initial_epoch, record_mass=True,
+                                                        record_elements=True)
+    propagator.propagate(initial_epoch, initial_epoch.shiftedBy(3600.))
+    ephemeris = handler.ephemeris
+
+    assert handler.states is None
+    assert len(ephemeris) == 61
+    assert ephemeris["t"][0] == pytest.approx(0., abs=1e-9)
+    assert ephemeris["a"] == pytest.approx(semi_major_axis, 1e-6)
+    assert ephemeris["mass"][0] == pytest.approx(1000., 1e-9)
+    assert ephemeris["x"][0] == pytest.approx(initial_orbit.getPosition().getX(), 1e-9)
+
+
+def test_formation_propagation_returns_aligned_ephemerides():
+    moon = CelestialBodyFactory.getMoon()
+    propagator_factory = PropagatorFactory(True, True, True)
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    duration = 3600.
+    initial_orbits = [lunar_orbit_factory.create_keplerian_orbit(initial_epoch, semi_major_axis, 0.1,
+                                                                 0.5, 0., 0., 0.)
+                      for semi_major_axis in (2000. * 1000, 2001. * 1000, 2002. * 1000)]
+
+    ephemerides = propagator_factory.propagate_formation(initial_orbits, initial_epoch,
+                                                         initial_epoch.shiftedBy(duration))
+
+    assert len(ephemerides) == 3
+    for ephemeris in ephemerides:
+        assert len(ephemeris) == len(ephemerides[0])
+        assert ephemeris["t"] == pytest.approx(ephemerides[0]["t"], abs=1e-9)
+    assert ephemerides[0]["t"][-1] == pytest.approx(duration, 1e-9)
+
+
+def test_force_models_and_propagators_are_reused():
+    moon = CelestialBodyFactory.getMoon()
+    propagator_factory = PropagatorFactory(True, True, True)
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    initial_orbit = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 2000. * 1000, 0.1, 0.5, 0., 0., 0.)
+
+    first_propagator = propagator_factory.acquire_propagator(initial_orbit)
+    first_propagator.propagate(initial_epoch.shiftedBy(600.))
+    propagator_factory.release_propagator(first_propagator)
+    second_propagator = propagator_factory.acquire_propagator(initial_orbit)
+    other_propagator = propagator_factory.acquire_propagator(initial_orbit)
+    statistics = propagator_factory.statistics()
+
+    assert second_propagator is first_propagator
+    assert second_propagator.getInitialState().getDate().durationFrom(initial_epoch) == pytest.approx(0., abs=1e-9)
+    assert statistics["built"]["propagator"] == 2
+    assert statistics["reused"]["propagator"] == 1
+    assert statistics["built"]["geopotential"] == 1
+    assert statistics["reused"]["geopotential"] == 1
+    assert statistics["built"]["sun_third_body"] == 1
+    assert other_propagator is not first_propagator
+
+
+def test_dense_output_ephemeris_matches_fixed_step_ephemeris():
+    moon = CelestialBodyFactory.getMoon()
+    propagator_factory = PropagatorFactory(True, True, True)
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    end_epoch = initial_epoch.shiftedBy(7200.)
+    initial_orbit = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 6787.4 * 1000, 0.73, 1.57, 0., 0., 0.)
+
+    polynomial_ephemeris = propagator_factory.propagate_dense(initial_orbit, initial_epoch, end_epoch)
+    fixed_step_ephemeris = propagator_factory.propagate_formation([initial_orbit], initial_epoch, end_epoch)[0]
+    interpolated_ephemeris = polynomial_ephemeris.evaluate(fixed_step_ephemeris["t"])
+
+    assert polynomial_ephemeris.end == pytest.approx(7200., 1e-9)
+    for component in ("x", "y", "z"):
+        assert interpolated_ephemeris[component] == pytest.approx(fixed_step_ephemeris[component], abs=1e-2)
+
+
+def test_instrumented_formation_propagation_reports_integrator_and_force_model_metrics():
+    moon = CelestialBodyFactory.getMoon()
+    instrumentation = PropagationInstrumentation()
+    propagator_factory = PropagatorFactory(True, True, False, instrumentation=instrumentation)
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    initial_orbits = [lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 2000. * 1000, 0.1, 0.5, 0., 0., anomaly)
+                      for anomaly in (0., 0.01)]
+
+    ephemerides = propagator_factory.propagate_formation(initial_orbits, initial_epoch, initial_epoch.shiftedBy(3600.))
+    report = instrumentation.report()
+
+    assert report["counters"]["callback.ephemeris_step_handler.calls"] == sum(map(len, ephemerides))
+    assert report["counters"]["integrator.integrations"] == 2
+    assert report["counters"]["integrator.accepted_steps"] == report["step_size"]["count"] > 0
+    assert report["counters"]["force_model.geopotential.evaluations"] >= report["counters"]["integrator.accepted_steps"]
+    assert report["counters"]["force_model.earth_third_body.evaluations"] > 0
+    assert "force_model.sun_third_body.evaluations" not in report["counters"]
+    assert report["durations"]["propagate_in_parallel"] > 0.
+
+
+def test_fixed_step_handler_keeps_integrator_metrics_and_released_propagators_are_untracked():
+    moon = CelestialBodyFactory.getMoon()
+    instrumentation = PropagationInstrumentation()
+    propagator_factory = PropagatorFactory(True, False, False, instrumentation=instrumentation)
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    initial_orbit = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 2000. * 1000, 0.1, 0.5, 0., 0., 0.)
+
+    propagator = propagator_factory.acquire_propagator(initial_orbit)
+    handler = propagator_factory.add_fixed_step_handler(propagator)
+    propagator.propagate(initial_epoch, initial_epoch.shiftedBy(3600.))
+    propagator_factory.release_propagator(propagator)
+    counters = instrumentation.report()["counters"]
+
+    assert counters["integrator.integrations"] == 1
+    assert counters["integrator.accepted_steps"] > 0
+    assert (counters["integrator.evaluations"] - PropagationInstrumentation.INITIAL_EVALUATIONS) % \
+        PropagationInstrumentation.EVALUATIONS_PER_STEP == 0
+    assert counters["force_model.geopotential.evaluations"] >= counters["integrator.evaluations"]
+    assert counters["callback.ephemeris_step_handler.calls"] == len(handler.ephemeris)
+    assert propagator_factory.step_recorders == {}
@@ -0,0 +1,42 @@
+import json
+import time
+
+import pytest
+
+from src.propagation.PropagationInstrumentation import PropagationInstrumentation
+
+
+def test_report_aggregates_steps_forces_and_callbacks():
+    instrumentation = PropagationInstrumentation()
+    for step_size in (10., 100., 1000.):
+        instrumentation.record_step(step_size, time.perf_counter(), time.perf_counter())
+    instrumentation.record_integration(PropagationInstrumentation.INITIAL_EVALUATIONS +
+                                         5 * PropagationInstrumentation.EVALUATIONS_PER_STEP, 3)
+    for _ in range(4):
+        instrumentation.record_force_evaluation("geopotential", time.perf_counter())
+        instrumentation.record_callback("ephemeris_step_handler", time.perf_counter())
+
+    report = instrumentation.report()
+
+    assert report["counters"]["integrator.accepted_steps"] == 3
+    assert report["counters"]["integrator.estimated_rejected_steps"] == 2
+    assert report["counters"]["force_model.geopotential.evaluations"] == 4
+    assert report["step_size"]["mean"] == pytest.approx(370.)
+    assert sum(report["step_size"]["histogram"]["counts"]) == 3
+    assert report["callbacks"]["ephemeris_step_handler"]["count"] == 4
+    assert report["durations"]["callback.ephemeris_step_handler"] >= 0.
+
+
+def test_trace_is_written_in_chrome_format(tmp_path):
+    instrumentation = PropagationInstrumentation(max_trace_events=2)
+    with instrumentation.span("propagate_in_parallel"):
+        for _ in range(2):
+            instrumentation.record_callback("ephemeris_step_handler", time.perf_counter())
+    trace_path = tmp_path / "trace.json"
+
+    instrumentation.save_trace(str(trace_path))
+
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["ephemeris_step_handler"] * 2
+    assert all(event["ph"] == "X" and event["dur"] >= 0. for event in events)
+    assert instrumentation.counters["trace.dropped_events"] == 1
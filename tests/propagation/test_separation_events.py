@@ -0,0 +1,70 @@
+import orekit
+orekit.initVM()
+import numpy as np
+import pytest
+from org.orekit.bodies import CelestialBodyFactory
+from org.orekit.orbits import PositionAngleType
+from org.orekit.time import AbsoluteDate, TimeScalesFactory
+
+from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory
+from src.propagation import EphemerisAnalysis
+from src.propagation.PropagatorFactory import PropagatorFactory
+from src.propagation.SeparationEventMonitor import SeparationEventMonitor
+
+
+def test_threshold_crossing_and_periapsis_events_are_located():
+    moon = CelestialBodyFactory.getMoon()
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+    propagator_factory = PropagatorFactory(False, False, False)
+
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    end_epoch = initial_epoch.shiftedBy(4 * 3600.)
+    initial_orbit_primary = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 2000. * 1000, 0.1,
+                                                                       0.5, 0., 0., 0.)
+    initial_orbit_secondary = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 2001. * 1000, 0.1,
+                                                                         0.5, 0., 0., 0.)
+
+    monitor = SeparationEventMonitor(propagator_factory, distance_thresholds=(5000., 10000.), segment_duration=3600.)
+    events = monitor.monitor(initial_orbit_primary, initial_orbit_secondary, initial_epoch, end_epoch)
+
+    crossings = events[events["kind"] == "threshold_10000_outbound"]
+    first_crossings = events[events["kind"] == "threshold_5000_outbound"]
+    assert len(crossings) >= 1
+    assert crossings["distance"] == pytest.approx(np.full(len(crossings), 10000.), abs=1e-3)
+    assert first_crossings["distance"] == pytest.approx(np.full(len(first_crossings), 5000.), abs=1e-3)
+    assert first_crossings["t"][0] < crossings["t"][0]
+    assert np.count_nonzero(events["kind"] == "primary_periapsis") >= 1
+    assert np.count_nonzero(events["kind"] == "secondary_periapsis") >= 1
+    assert np.all(np.diff(events["t"]) >= 0.)
+    assert monitor.minimum_distance <= (1. - 0.1) * 1000 + 1.
+    assert monitor.maximum_distance >= np.nanmax(events["distance"])
+
+    primary_ephemeris, secondary_ephemeris = propagator_factory.propagate_formation(
+        [initial_orbit_primary, initial_orbit_secondary], initial_epoch, end_epoch, 1.)
+    sampled_crossing_time = EphemerisAnalysis.first_crossing_time(
+        primary_ephemeris["t"], EphemerisAnalysis.relative_distance(primary_ephemeris, secondary_ephemeris), 10000.)
+    assert crossings["t"][0] == pytest.approx(sampled_crossing_time, abs=1e-2)
+
+
+def test_crossing_on_a_segment_boundary_is_recorded_once():
+    moon = CelestialBodyFactory.getMoon()
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+    propagator_factory = PropagatorFactory(False, False, False)
+
+    initial_epoch = AbsoluteDate(2025, 1, 1, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    end_epoch = initial_epoch.shiftedBy(4 * 3600.)
+    initial_orbit_primary = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 2000. * 1000, 0.1,
+                                                                       0.5, 0., 0., 0.)
+    initial_orbit_secondary = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, 2001. * 1000, 0.1,
+                                                                         0.5, 0., 0., 0.)
+    reference_events = SeparationEventMonitor(propagator_factory).monitor(
+        initial_orbit_primary, initial_orbit_secondary, initial_epoch, end_epoch)
+    crossing_time = reference_events["t"][reference_events["kind"] == "threshold_10000_outbound"][0]
+
+    monitor = SeparationEventMonitor(propagator_factory, segment_duration=crossing_time)
+    events = monitor.monitor(initial_orbit_primary, initial_orbit_secondary, initial_epoch, end_epoch)
+
+    crossings = events["t"][events["kind"] == "threshold_10000_outbound"]
+    assert len(crossings) == np.count_nonzero(reference_events["kind"] == "threshold_10000_outbound")
+    assert crossings[0] == pytest.approx(crossing_time, abs=1e-3)
+    assert propagator_factory.statistics()["built"]["propagator"] == 2
@@ -0,0 +1,82 @@
+import orekit
+orekit.initVM()
+import numpy as np
+import pytest
+from org.orekit.bodies import CelestialBodyFactory
+from org.orekit.orbits import PositionAngleType
+from org.orekit.time import AbsoluteDate, TimeScalesFactory
+
+from src.orbits import OrbitUtils
+from src.orbits.KeplerianOrbitFactory import KeplerianOrbitFactory
+from src.propagation.PropagatorFactory import PropagatorFactory
+from src.propagation.SeparationTargetingSolver import SeparationTargetingSolver
+
+SEMI_MAJOR_AXIS = 6787.4 * 1000
+ECCENTRICITY = 0.7292925
+
+
+def create_solver(is_tangential=True):
+    moon = CelestialBodyFactory.getMoon()
+    lunar_orbit_factory = KeplerianOrbitFactory(PositionAngleType.TRUE, moon.getInertiallyOrientedFrame(), moon.getGM())
+    initial_epoch = AbsoluteDate(2025, 1, 23, 0, 0, 0.0, TimeScalesFactory.getUTC())
+    initial_orbit = lunar_orbit_factory.create_keplerian_orbit(initial_epoch, SEMI_MAJOR_AXIS, ECCENTRICITY,
+                                                               np.pi / 2, 0., 0., 0.)
+    target_epoch = initial_epoch.shiftedBy(float(OrbitUtils.keplerian_period_equation(moon.getGM(),
+                                                                                      SEMI_MAJOR_AXIS)))
+    solver = SeparationTargetingSolver(PropagatorFactory(True, True, True), lunar_orbit_factory, is_tangential)
+    return solver, initial_orbit, target_epoch
+
+
+def test_tangential_delta_v_converges_in_a_few_propagations():
+    solver, initial_orbit, target_epoch = create_solver()
+
+    result = solver.solve(initial_orbit, target_epoch, 10000.)
+
+    assert result.converged
+    assert result.iterations <= 3
+    assert result.achieved_separation == pytest.approx(10000., abs=solver.tolerance)
+    assert result.delta_v_tnw[0] == pytest.approx(0.0104, 1e-1)
+    assert result.delta_v_tnw[1:] == pytest.approx([0., 0.])
+
+
+def test_batch_of_targets_is_warm_started():
+    solver, initial_orbit, target_epoch = create_solver(is_tangential=False)
+
+    results = solver.solve_batch(initial_orbit, target_epoch, [20000., 5000., 10000.])
+
+    assert [result.target_separation for result in results] == [20000., 5000., 10000.]
+    for result in results:
+        assert result.converged
+        assert result.achieved_separation == pytest.approx(result.target_separation, abs=solver.tolerance)
+    assert results[0].iterations <= 2
+
+
+def test_coincident_start_is_reported_as_not_converged():
+    solver, initial_orbit, target_epoch = create_solver()
+
+    result = solver.solve(initial_orbit, target_epoch, 10000., initial_guess=np.zeros(3))
+
+    assert not result.converged
+    assert result.iterations == 1
+    assert np.all(np.isfinite(result.delta_v_tnw))
+
+
+def test_batch_with_a_zero_target_does_not_warm_start_from_it():
+    solver, initial_orbit, target_epoch = create_solver()
+
+    results = solver.solve_batch(initial_orbit, target_epoch, [10000., 0.])
+
+    assert [result.converged for result in results] == [True, True]
+    assert results[0].achieved_separation == pytest.approx(10000., abs=solver.tolerance)
+    assert np.all(np.isfinite(results[0].delta_v_tnw))
+
+
+def test_primary_and_secondary_share_one_stm_propagator():
+    solver, initial_orbit, target_epoch = create_solver()
+
+    relative_position, _ = solver.propagate_secondary(initial_orbit, target_epoch, np.zeros(3),
+                                                      solver.propagate_primary(initial_orbit, target_epoch))
+    solver.solve(initial_orbit, target_epoch, 10000.)
+
+    assert np.linalg.norm(relative_position) < 1e-6
+    assert solver.propagator_factory.built_counter["propagator"] == 1
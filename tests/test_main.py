@@ -0,0 +1,27 @@
+import orekit
+orekit.initVM()
+import numpy as np
+
+from src import main
+from src.propagation.EphemerisCache import EphemerisCache
+from src.propagation.PropagatorFactory import PropagatorFactory
+
+
+def test_repeated_run_is_loaded_from_the_cache(tmp_path, monkeypatch):
+    arguments = main.parse_arguments(["--cache-dir", str(tmp_path / "cache")])
+    propagate_formation = PropagatorFactory.propagate_formation
+    calls = []
+
+    def counted_propagate_formation(propagator_factory, *args, **kwargs):
+        calls.append(args)
+        return propagate_formation(propagator_factory, *args, **kwargs)
+
+    monkeypatch.setattr(PropagatorFactory, "propagate_formation", counted_propagate_formation)
+    design = dict(main.design_separation(), keplerian_period=600.)
+    ephemerides = main.propagate_separation(design, cache=EphemerisCache(arguments.cache_dir,
+                                                                         data_path=arguments.data_path))
+    cached_ephemerides = main.propagate_separation(design, cache=EphemerisCache(arguments.cache_dir,
+                                                                                data_path=arguments.data_path))
+
+    assert len(calls) == 1
+    assert all(map(np.array_equal, cached_ephemerides, ephemerides))